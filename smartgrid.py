@@ -6,12 +6,17 @@ Author: C0sm0cats (2025)
 """
 
 import os
+import re
 import ctypes
+import pickle
 import time
 import threading
 import winsound
 import bisect
 import math
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from ctypes import wintypes
 import win32gui
 import win32api
@@ -48,7 +53,22 @@ RETILE_DEBOUNCE = 0.05  # 50ms between auto-retiles
 CACHE_TTL = 5.0  # Cache validity duration
 TILE_TIMEOUT = 2.0  # Max time for tiling operation
 MAX_TILE_RETRIES = 10
+TILE_SETTLE = 1.0 / 60  # One compositor frame after a batched tile pass
+TILE_CORRECTION_LOOP = True  # Re-measure/re-apply when a window misses its size (legacy apps)
 DRAG_THRESHOLD = 10
+MONITOR_POLL_INTERVAL = 0.06  # monitor_loop cadence while events are flowing
+MONITOR_HOT_PERIOD = 1.0  # Keep polling this long after the last window event
+MONITOR_IDLE_TIMEOUT = 1.0  # Safety-net pass when no window event arrives
+VISIBLE_RECONCILE_INTERVAL = 30.0  # Max age of the event-maintained visible-window index
+MONITOR_CACHE_TTL = 1.0  # Monitor list reuse when no display-change listener is running
+FRAME_BORDER_TTL = 0.25  # Frame border reuse when no WinEvent hooks invalidate the cache
+
+# Persisted settings (written on quit, read at startup)
+STATE_FILE = os.path.join(
+    os.environ.get("APPDATA") or os.path.expanduser("~"), "SmartGrid", "state.pkl"
+)
+STATE_VERSION = 1
+STATE_SLOTS_INTERVAL = 1.0  # Quiet seconds after a retile before the slot snapshot is written
 
 # DWM attributes
 DWMWA_BORDER_COLOR = 34
@@ -78,11 +98,16 @@ UNDO_SLOT_BTN_HOVER_FG = "#1E3A8A"
 GWL_STYLE = -16
 WS_THICKFRAME = 0x00040000
 WS_MAXIMIZE = 0x01000000
+WS_MINIMIZE = 0x20000000
+WS_VISIBLE = 0x10000000
 
 # ShowWindow commands
 SW_RESTORE = 9
 SW_SHOWNORMAL = 1
 
+# GetAncestor flags
+GA_ROOT = 2
+
 # SetWindowPos flags
 SWP_NOZORDER = 0x0004
 SWP_NOMOVE = 0x0002
@@ -91,6 +116,39 @@ SWP_NOACTIVATE = 0x0010
 SWP_FRAMECHANGED = 0x0020
 SWP_NOSENDCHANGING = 0x0400
 
+# Raw input (mouse button stream for drag detection)
+WM_INPUT = 0x00FF
+PM_REMOVE = 0x0001
+HWND_MESSAGE = -3
+RID_INPUT = 0x10000003
+RIM_TYPEMOUSE = 0
+RIDEV_REMOVE = 0x00000001
+RIDEV_INPUTSINK = 0x00000100
+RI_MOUSE_LEFT_BUTTON_DOWN = 0x0001
+RI_MOUSE_LEFT_BUTTON_UP = 0x0002
+
+# WinEvent hooks (window state tracking without polling)
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_SYSTEM_MINIMIZESTART = 0x0016
+EVENT_SYSTEM_MINIMIZEEND = 0x0017
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+
+# (event_min, event_max) ranges hooked by SmartGrid._win_event_loop
+WIN_EVENT_RANGES = (
+    (EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND),
+    (EVENT_SYSTEM_MINIMIZESTART, EVENT_SYSTEM_MINIMIZEEND),
+    (EVENT_OBJECT_DESTROY, EVENT_OBJECT_HIDE),
+    (EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_NAMECHANGE),
+)
+
 # Hotkey IDs
 HOTKEY_TOGGLE = 9001
 HOTKEY_RETILE = 9002
@@ -107,6 +165,27 @@ HOTKEY_SWAP_CONFIRM = 9010
 HOTKEY_FLOAT_TOGGLE = 9011
 HOTKEY_LAYOUT_PICKER = 9012
 
+# (id, modifiers, virtual key) registered at startup / while in swap mode
+_MOD_CTRL_ALT = win32con.MOD_CONTROL | win32con.MOD_ALT
+HOTKEY_TABLE = (
+    (HOTKEY_TOGGLE, _MOD_CTRL_ALT, ord('T')),
+    (HOTKEY_RETILE, _MOD_CTRL_ALT, ord('R')),
+    (HOTKEY_QUIT, _MOD_CTRL_ALT, ord('Q')),
+    (HOTKEY_SWAP_MODE, _MOD_CTRL_ALT, ord('S')),
+    (HOTKEY_WS1, _MOD_CTRL_ALT, ord('1')),
+    (HOTKEY_WS2, _MOD_CTRL_ALT, ord('2')),
+    (HOTKEY_WS3, _MOD_CTRL_ALT, ord('3')),
+    (HOTKEY_FLOAT_TOGGLE, _MOD_CTRL_ALT, ord('F')),
+    (HOTKEY_LAYOUT_PICKER, _MOD_CTRL_ALT, ord('P')),
+)
+SWAP_HOTKEY_TABLE = (
+    (HOTKEY_SWAP_LEFT, 0, win32con.VK_LEFT),
+    (HOTKEY_SWAP_RIGHT, 0, win32con.VK_RIGHT),
+    (HOTKEY_SWAP_UP, 0, win32con.VK_UP),
+    (HOTKEY_SWAP_DOWN, 0, win32con.VK_DOWN),
+    (HOTKEY_SWAP_CONFIRM, 0, win32con.VK_RETURN),
+)
+
 # Custom messages
 CUSTOM_TOGGLE_SWAP = 0x9000
 CUSTOM_OPEN_LAYOUT_PICKER = 0x9001
@@ -115,34 +194,306 @@ CUSTOM_OPEN_SETTINGS = 0x9002
 # Win32 API
 user32 = ctypes.WinDLL('user32', use_last_error=True)
 dwmapi = ctypes.WinDLL('dwmapi')
+ntdll = ctypes.WinDLL('ntdll')
+kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+winmm = ctypes.WinDLL('winmm')
+
+WINEVENTPROC = ctypes.WINFUNCTYPE(
+    None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+    wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+)
+user32.SetWinEventHook.argtypes = [
+    wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WINEVENTPROC,
+    wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+]
+user32.SetWinEventHook.restype = wintypes.HANDLE
+user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+user32.MonitorFromPoint.argtypes = [wintypes.POINT, wintypes.DWORD]
+user32.MonitorFromPoint.restype = wintypes.HMONITOR
+user32.MonitorFromRect.argtypes = [ctypes.POINTER(wintypes.RECT), wintypes.DWORD]
+user32.MonitorFromRect.restype = wintypes.HMONITOR
+user32.BeginDeferWindowPos.argtypes = [ctypes.c_int]
+user32.BeginDeferWindowPos.restype = wintypes.HANDLE
+user32.DeferWindowPos.argtypes = [
+    wintypes.HANDLE, wintypes.HWND, wintypes.HWND,
+    ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, wintypes.UINT
+]
+user32.DeferWindowPos.restype = wintypes.HANDLE
+user32.EndDeferWindowPos.argtypes = [wintypes.HANDLE]
+
+# Typed prototypes for the per-window hot path (skips per-call argument guessing)
+user32.IsWindow.argtypes = [wintypes.HWND]
+user32.IsWindow.restype = wintypes.BOOL
+user32.IsWindowVisible.argtypes = [wintypes.HWND]
+user32.IsWindowVisible.restype = wintypes.BOOL
+user32.GetWindowRect.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.RECT)]
+user32.GetWindowRect.restype = wintypes.BOOL
+user32.ShowWindowAsync.argtypes = [wintypes.HWND, ctypes.c_int]
+user32.ShowWindowAsync.restype = wintypes.BOOL
+user32.GetForegroundWindow.argtypes = []
+user32.GetForegroundWindow.restype = wintypes.HWND
+user32.GetAncestor.argtypes = [wintypes.HWND, wintypes.UINT]
+user32.GetAncestor.restype = wintypes.HWND
+user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+user32.GetWindowTextW.restype = ctypes.c_int
+user32.GetClassNameW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+user32.GetClassNameW.restype = ctypes.c_int
+user32.GetWindowLongW.argtypes = [wintypes.HWND, ctypes.c_int]
+user32.GetWindowLongW.restype = wintypes.LONG
+dwmapi.DwmGetWindowAttribute.argtypes = [
+    wintypes.HWND, wintypes.DWORD, ctypes.c_void_p, wintypes.DWORD
+]
+dwmapi.DwmGetWindowAttribute.restype = ctypes.c_long  # HRESULT
+dwmapi.DwmSetWindowAttribute.argtypes = [
+    wintypes.HWND, wintypes.DWORD, ctypes.c_void_p, wintypes.DWORD
+]
+dwmapi.DwmSetWindowAttribute.restype = ctypes.c_long  # HRESULT
+user32.RegisterHotKey.argtypes = [wintypes.HWND, ctypes.c_int, wintypes.UINT, wintypes.UINT]
+user32.RegisterHotKey.restype = wintypes.BOOL
+user32.UnregisterHotKey.argtypes = [wintypes.HWND, ctypes.c_int]
+user32.UnregisterHotKey.restype = wintypes.BOOL
+
+class GUITHREADINFO(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", wintypes.DWORD),
+        ("flags", wintypes.DWORD),
+        ("hwndActive", wintypes.HWND),
+        ("hwndFocus", wintypes.HWND),
+        ("hwndCapture", wintypes.HWND),
+        ("hwndMenuOwner", wintypes.HWND),
+        ("hwndMoveSize", wintypes.HWND),
+        ("hwndCaret", wintypes.HWND),
+        ("rcCaret", wintypes.RECT),
+    ]
+
+user32.GetGUIThreadInfo.argtypes = [wintypes.DWORD, ctypes.POINTER(GUITHREADINFO)]
+user32.GetGUIThreadInfo.restype = wintypes.BOOL
+
+class PAINTSTRUCT(ctypes.Structure):
+    _fields_ = [
+        ("hdc", wintypes.HDC), ("fErase", wintypes.BOOL),
+        ("rcPaint", wintypes.RECT), ("fRestore", wintypes.BOOL),
+        ("fIncUpdate", wintypes.BOOL), ("rgbReserved", ctypes.c_char * 32)
+    ]
+
+class UNICODE_STRING(ctypes.Structure):
+    _fields_ = [
+        ("Length", wintypes.USHORT),
+        ("MaximumLength", wintypes.USHORT),
+        ("Buffer", ctypes.c_void_p),
+    ]
+
+class SYSTEM_PROCESS_INFORMATION(ctypes.Structure):
+    # Leading fields of the winternl.h layout (enough to reach the PID)
+    _fields_ = [
+        ("NextEntryOffset", wintypes.ULONG),
+        ("NumberOfThreads", wintypes.ULONG),
+        ("Reserved1", ctypes.c_byte * 48),
+        ("ImageName", UNICODE_STRING),
+        ("BasePriority", wintypes.LONG),
+        ("UniqueProcessId", ctypes.c_void_p),
+    ]
+
+ntdll.NtQuerySystemInformation.argtypes = [
+    wintypes.ULONG, ctypes.c_void_p, wintypes.ULONG, ctypes.POINTER(wintypes.ULONG)
+]
+ntdll.NtQuerySystemInformation.restype = ctypes.c_long  # NTSTATUS
+
+SYSTEM_PROCESS_INFORMATION_CLASS = 5
+STATUS_INFO_LENGTH_MISMATCH = 0xC0000004
+
+MONITOR_DEFAULTTONULL = 0
+MONITOR_DEFAULTTONEAREST = 2
+
+# High-resolution waitable timer (Windows 10 1803+) for sub-ms frame pacing
+CREATE_WAITABLE_TIMER_HIGH_RESOLUTION = 0x00000002
+TIMER_ALL_ACCESS = 0x001F0003
+INFINITE = 0xFFFFFFFF
+
+kernel32.CreateWaitableTimerExW.argtypes = [
+    ctypes.c_void_p, wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD
+]
+kernel32.CreateWaitableTimerExW.restype = wintypes.HANDLE
+kernel32.SetWaitableTimer.argtypes = [
+    wintypes.HANDLE, ctypes.POINTER(wintypes.LARGE_INTEGER), wintypes.LONG,
+    ctypes.c_void_p, ctypes.c_void_p, wintypes.BOOL
+]
+kernel32.SetWaitableTimer.restype = wintypes.BOOL
+kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+kernel32.WaitForSingleObject.restype = wintypes.DWORD
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+kernel32.OpenProcess.restype = wintypes.HANDLE
+kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+kernel32.CloseHandle.restype = wintypes.BOOL
+kernel32.QueryFullProcessImageNameW.argtypes = [
+    wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR, ctypes.POINTER(wintypes.DWORD)
+]
+kernel32.QueryFullProcessImageNameW.restype = wintypes.BOOL
+kernel32.K32GetProcessImageFileNameW.argtypes = [wintypes.HANDLE, wintypes.LPWSTR, wintypes.DWORD]
+kernel32.K32GetProcessImageFileNameW.restype = wintypes.DWORD
+
+winmm.timeBeginPeriod.argtypes = [wintypes.UINT]
+winmm.timeBeginPeriod.restype = wintypes.UINT
+winmm.timeEndPeriod.argtypes = [wintypes.UINT]
+winmm.timeEndPeriod.restype = wintypes.UINT
 
 # ==============================================================================
 # UTILITY FUNCTIONS (Global helpers - stateless)
 # ==============================================================================
 
+# Idle high-resolution timer handles shared by all threads: short-lived Timer
+# threads borrow one instead of creating (and leaking) their own
+_precise_timers = []
+_precise_timers_lock = threading.Lock()
+_precise_timer_supported = True  # False → timeBeginPeriod fallback
+
+def precise_sleep(seconds):
+    """Sleep with sub-ms granularity (default time.sleep rounds up to the ~15.6ms tick)."""
+    global _precise_timer_supported
+    if seconds <= 0:
+        return
+    timer = 0
+    if _precise_timer_supported:
+        with _precise_timers_lock:
+            if _precise_timers:
+                timer = _precise_timers.pop()
+        if not timer:
+            try:
+                timer = kernel32.CreateWaitableTimerExW(
+                    None, None, CREATE_WAITABLE_TIMER_HIGH_RESOLUTION, TIMER_ALL_ACCESS
+                ) or 0
+            except Exception:
+                timer = 0
+            if not timer:
+                _precise_timer_supported = False
+    
+    if timer:
+        try:
+            due = wintypes.LARGE_INTEGER(-max(1, int(seconds * 1e7)))  # relative, 100ns units
+            if kernel32.SetWaitableTimer(timer, ctypes.byref(due), 0, None, None, False):
+                kernel32.WaitForSingleObject(timer, INFINITE)
+                return
+        finally:
+            # Handle goes back to the pool (bounded by concurrent sleepers)
+            with _precise_timers_lock:
+                _precise_timers.append(timer)
+    
+    # Older Windows: raise the system timer resolution just for this wait
+    winmm.timeBeginPeriod(1)
+    try:
+        time.sleep(seconds)
+    finally:
+        winmm.timeEndPeriod(1)
+
+# Per-thread 256-char scratch buffer for window title/class reads (EnumWindows
+# callbacks run on the calling thread, so reuse is safe)
+_text_tls = threading.local()
+
+def text_buffer():
+    """Return this thread's reusable 256-char unicode buffer."""
+    buf = getattr(_text_tls, "buf", None)
+    if buf is None:
+        buf = _text_tls.buf = ctypes.create_unicode_buffer(256)
+    return buf
+
+# Per-thread scratch RECTs (with their byref) for hot GetWindowRect reads
+_rect_tls = threading.local()
+
+def scratch_rect(slot=0):
+    """Return this thread's reusable (RECT, byref(RECT)) pair for slot."""
+    pairs = getattr(_rect_tls, "pairs", None)
+    if pairs is None:
+        pairs = _rect_tls.pairs = {}
+    pair = pairs.get(slot)
+    if pair is None:
+        rect = wintypes.RECT()
+        pair = pairs[slot] = (rect, ctypes.byref(rect))
+    return pair
+
+def get_window_title(hwnd):
+    """Return window title (empty string on error) without a per-call buffer allocation."""
+    buf = text_buffer()
+    return buf[:user32.GetWindowTextW(hwnd, buf, 256)]
+
+# HMONITOR → (index, work rect) from the latest get_monitors() enumeration
+_hmonitor_to_idx = {}
+
+class MONITORINFO(ctypes.Structure):
+    _fields_ = [("cbSize", wintypes.DWORD), ("rcMonitor", wintypes.RECT),
+                ("rcWork", wintypes.RECT), ("dwFlags", wintypes.DWORD)]
+
+MONITORENUMPROC = ctypes.WINFUNCTYPE(ctypes.c_bool, wintypes.HMONITOR, wintypes.HDC,
+                                     ctypes.POINTER(wintypes.RECT), wintypes.LPARAM)
+
+# Cached get_monitors() result; dropped by invalidate_monitor_cache() on display
+# changes (see SmartGrid._create_display_listener), else refreshed after MONITOR_CACHE_TTL
+_monitor_cache = None
+_monitor_cache_time = 0.0
+_monitor_cache_listening = False
+_monitor_enum_lock = threading.Lock()
+_monitor_enum_acc = []  # (hmonitor, work rect) filled by _enum_monitor_proc
+
+@MONITORENUMPROC
+def _enum_monitor_proc(hMonitor, hdc, lprc, data):
+    mi = MONITORINFO()
+    mi.cbSize = ctypes.sizeof(mi)
+    user32.GetMonitorInfoW(hMonitor, ctypes.byref(mi))
+    r = mi.rcWork
+    _monitor_enum_acc.append((hMonitor, (r.left, r.top, r.right - r.left, r.bottom - r.top)))
+    return True
+
+WNDENUMPROC = ctypes.WINFUNCTYPE(ctypes.c_bool, wintypes.HWND, wintypes.LPARAM)
+user32.EnumWindows.argtypes = [WNDENUMPROC, wintypes.LPARAM]
+user32.EnumWindows.restype = wintypes.BOOL
+
+_window_enum_lock = threading.Lock()
+_window_enum_acc = []  # hwnds filled by _enum_window_proc
+
+@WNDENUMPROC
+def _enum_window_proc(hwnd, lparam):
+    _window_enum_acc.append(hwnd)
+    return True
+
+def enum_top_level_windows():
+    """Return all top-level hwnds in Z-order (one shared EnumWindows thunk)."""
+    with _window_enum_lock:
+        _window_enum_acc.clear()
+        try:
+            user32.EnumWindows(_enum_window_proc, 0)
+        except Exception as e:
+            log(f"[ERROR] EnumWindows failed: {e}")
+        return list(_window_enum_acc)
+
+def invalidate_monitor_cache():
+    """Force the next get_monitors() call to re-enumerate displays."""
+    global _monitor_cache
+    _monitor_cache = None
+
 def get_monitors():
     """Return list of work area rectangles (x, y, w, h) for all monitors."""
-    monitors = []
-    def enum_proc(hMonitor, hdc, lprc, data):
-        class MONITORINFO(ctypes.Structure):
-            _fields_ = [("cbSize", wintypes.DWORD), ("rcMonitor", wintypes.RECT),
-                        ("rcWork", wintypes.RECT), ("dwFlags", wintypes.DWORD)]
-        mi = MONITORINFO()
-        mi.cbSize = ctypes.sizeof(mi)
-        user32.GetMonitorInfoW(hMonitor, ctypes.byref(mi))
-        r = mi.rcWork
-        monitors.append((r.left, r.top, r.right - r.left, r.bottom - r.top))
-        return True
+    global _hmonitor_to_idx, _monitor_cache, _monitor_cache_time
+    cached = _monitor_cache
+    if cached is not None and (_monitor_cache_listening or
+                               time.time() - _monitor_cache_time < MONITOR_CACHE_TTL):
+        return list(cached)
     
-    try:
-        user32.EnumDisplayMonitors(None, None,
-            ctypes.WINFUNCTYPE(ctypes.c_bool, wintypes.HMONITOR, wintypes.HDC,
-                               ctypes.POINTER(wintypes.RECT), wintypes.LPARAM)(enum_proc), 0)
-    except Exception as e:
-        log(f"[ERROR] EnumDisplayMonitors failed: {e}")
+    with _monitor_enum_lock:
+        _monitor_enum_acc.clear()
+        try:
+            user32.EnumDisplayMonitors(None, None, _enum_monitor_proc, 0)
+        except Exception as e:
+            log(f"[ERROR] EnumDisplayMonitors failed: {e}")
+        entries = list(_monitor_enum_acc)
+    
+    monitors = [rect for _, rect in entries]
+    _hmonitor_to_idx = {h: (i, rect) for i, (h, rect) in enumerate(entries)}
     
     if not monitors:
         monitors = [(0, 0, win32gui.GetSystemMetrics(0), win32gui.GetSystemMetrics(1))]
+    _monitor_cache = tuple(monitors)
+    _monitor_cache_time = time.time()
     return monitors
 
 def get_window_state(hwnd):
@@ -187,36 +538,112 @@ def get_frame_borders(hwnd):
     
     return 0, 0, 0, 0
 
-def set_window_border(hwnd, color):
+# Last border color applied per hwnd (None = cleared) to skip redundant DWM calls
+_border_color_cache = {}
+_BORDER_UNSET = object()  # Sentinel: None is a valid cached value (border cleared)
+_COLORREF_SIZE = ctypes.sizeof(ctypes.c_uint)
+
+def set_window_border(hwnd, color, force_redraw=False):
     """Apply (or remove) a colored DWM border."""
+    # Unchanged color: pure dict compare, no user32/DWM calls (dead hwnds are
+    # dropped by the WinEvent destroy handler and cleanup_windows)
+    if not force_redraw and hwnd and _border_color_cache.get(hwnd, _BORDER_UNSET) == color:
+        return
+    
     if not hwnd or not user32.IsWindow(hwnd):
+        _border_color_cache.pop(hwnd, None)
         return
     
     try:
-        if color is None:
-            dwmapi.DwmSetWindowAttribute(
-                hwnd, DWMWA_BORDER_COLOR,
-                ctypes.byref(ctypes.c_uint(DWMWA_COLOR_NONE)),
-                ctypes.sizeof(ctypes.c_uint)
-            )
-        else:
-            dwmapi.DwmSetWindowAttribute(
-                hwnd, DWMWA_BORDER_COLOR,
-                ctypes.byref(ctypes.c_uint(color)),
-                ctypes.sizeof(ctypes.c_uint)
-            )
+        # Borders are set from the hook, action and monitor threads, so the value stays per call
+        value = ctypes.c_uint(DWMWA_COLOR_NONE if color is None else color)
+        dwmapi.DwmSetWindowAttribute(hwnd, DWMWA_BORDER_COLOR, ctypes.byref(value), _COLORREF_SIZE)
+        _border_color_cache[hwnd] = color
     except Exception as e:
+        _border_color_cache.pop(hwnd, None)
         log(f"[ERROR] set_window_border failed: {e}")
 
-def get_process_name(hwnd):
+# Shared placeholder rect for saved entries whose real position is irrelevant
+_DUMMY_POS = (0, 0, 800, 600)
+
+def normalize_saved_pos(pos):
+    """Coerce a persisted (x, y, w, h) to an int tuple, _DUMMY_POS if malformed."""
+    if not isinstance(pos, (list, tuple)) or len(pos) != 4:
+        return _DUMMY_POS
+    try:
+        return (int(pos[0]), int(pos[1]), int(pos[2]), int(pos[3]))
+    except Exception:
+        return _DUMMY_POS
+
+def foreground_snapshot():
+    """Return (active_hwnd, focus_hwnd) of the foreground thread in one call, or None."""
+    gti = GUITHREADINFO(cbSize=ctypes.sizeof(GUITHREADINFO))
+    try:
+        if not user32.GetGUIThreadInfo(0, ctypes.byref(gti)) or not gti.hwndActive:
+            return None
+    except Exception:
+        return None
+    return gti.hwndActive, gti.hwndFocus
+
+def build_pid_name_map():
+    """Return {pid: 'image.exe'} for all processes from one NtQuerySystemInformation snapshot."""
+    size = 512 * 1024
+    needed = wintypes.ULONG(0)
+    try:
+        for _ in range(4):
+            buf = ctypes.create_string_buffer(size)
+            status = ntdll.NtQuerySystemInformation(
+                SYSTEM_PROCESS_INFORMATION_CLASS, buf, size, ctypes.byref(needed)
+            ) & 0xFFFFFFFF
+            if status != STATUS_INFO_LENGTH_MISMATCH:
+                break
+            size = max(size * 2, needed.value + 64 * 1024)
+        if status != 0:
+            return {}
+        
+        pid_map = {}
+        offset = 0
+        while True:
+            info = SYSTEM_PROCESS_INFORMATION.from_buffer(buf, offset)
+            name = info.ImageName
+            if name.Buffer and name.Length:
+                pid_map[info.UniqueProcessId or 0] = ctypes.wstring_at(name.Buffer, name.Length // 2).lower()
+            if not info.NextEntryOffset:
+                break
+            offset += info.NextEntryOffset
+        return pid_map
+    except Exception as e:
+        log(f"[ERROR] build_pid_name_map: {e}")
+        return {}
+
+def get_process_name(hwnd, pid_map=None):
     """Return process name (e.g., 'ms-teams.exe') or empty string on error."""
     if not hwnd:
         return ""
     try:
         _, process_id = win32process.GetWindowThreadProcessId(hwnd)
-        h_process = win32api.OpenProcess(0x0410, False, process_id)
-        path = win32process.GetModuleFileNameEx(h_process, 0)
-        win32api.CloseHandle(h_process)
+    except Exception:
+        return ""
+    if pid_map:
+        name = pid_map.get(process_id)
+        if name:
+            return name
+    try:
+        # Limited query right + kernel-side image name: no remote module walk
+        h_process = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, process_id)
+        if not h_process:
+            return ""
+        try:
+            buf = ctypes.create_unicode_buffer(260)
+            size = wintypes.DWORD(len(buf))
+            if kernel32.QueryFullProcessImageNameW(h_process, 0, buf, ctypes.byref(size)):
+                path = buf.value
+            elif kernel32.K32GetProcessImageFileNameW(h_process, buf, len(buf)):
+                path = buf.value  # \Device\... form; only the basename is used
+            else:
+                return ""
+        finally:
+            kernel32.CloseHandle(h_process)
         return os.path.basename(path).lower()
     except Exception:
         return ""
@@ -233,17 +660,108 @@ def get_window_size(hwnd):
         pass
     return 0, 0
 
-def is_useful_window(title, class_name="", hwnd=None):
+# Swap navigation: direction → (is_horizontal, sign)
+_DIRECTION_CODES = {
+    "right": (True, 1),
+    "left": (True, -1),
+    "down": (False, 1),
+    "up": (False, -1),
+}
+
+def find_in_direction(from_rect, rects, direction):
+    """Return index of the closest rect in direction from from_rect, or -1."""
+    code = _DIRECTION_CODES.get(direction)
+    if code is None:
+        return -1
+    horizontal, sign = code
+    
+    fx1, fy1, fx2, fy2 = from_rect
+    fcx, fcy = (fx1 + fx2) // 2, (fy1 + fy2) // 2
+    
+    # Threshold depends only on the source window: compute once
+    if horizontal:
+        min_overlap = max(20, int((fy2 - fy1) * 0.20))
+    else:
+        min_overlap = max(20, int((fx2 - fx1) * 0.20))
+    
+    best_idx = -1
+    best_score = float('inf')
+    
+    # One loop per axis: the primary-axis test runs first and rejects most
+    # candidates before the perpendicular overlap/distance math is touched
+    if horizontal:
+        for i, (x1, y1, x2, y2) in enumerate(rects):
+            dx = (x1 + x2) // 2 - fcx
+            if dx * sign <= 30:
+                continue
+            overlap = (fy2 if fy2 < y2 else y2) - (fy1 if fy1 > y1 else y1)
+            if overlap < min_overlap:
+                continue
+            dy = (y1 + y2) // 2 - fcy
+            # Euclidean distance minus alignment bonus
+            score = (dx * dx) + (dy * dy) - overlap * 10
+            if score < best_score:
+                best_score = score
+                best_idx = i
+    else:
+        for i, (x1, y1, x2, y2) in enumerate(rects):
+            dy = (y1 + y2) // 2 - fcy
+            if dy * sign <= 30:
+                continue
+            overlap = (fx2 if fx2 < x2 else x2) - (fx1 if fx1 > x1 else x1)
+            if overlap < min_overlap:
+                continue
+            dx = (x1 + x2) // 2 - fcx
+            score = (dx * dx) + (dy * dy) - overlap * 10
+            if score < best_score:
+                best_score = score
+                best_idx = i
+    
+    return best_idx
+
+# Window filters used by is_useful_window (titles match as lowercase substrings)
+BAD_TITLES = (
+    "zscaler", "spotify", "discord", "steam", "call", "meeting", "join", "incoming call",
+    "obs", "streamlabs", "twitch studio", "nvidia overlay", "geforce experience",
+    "shadowplay", "radeon software", "amd relive", "rainmeter", "wallpaper engine",
+    "lively wallpaper", "msi afterburner", "rtss", "rivatuner", "hwinfo", "hwmonitor",
+    "displayfusion", "actual window", "aquasnap", "powertoys", "fancyzones",
+    "picture in picture", "pip", "miniplayer", "mini player", "youtube music",
+    "vlc media player", "media player classic", "battle.net", "origin", "epic games",
+    "gog galaxy", "uplay", "ubisoft connect", "ea app", "game bar", "xbox",
+    "notification", "toast", "popup", "tooltip", "splash", "alert", "flyout",
+    "volume control", "brightness", "program manager", "start", "cortana", "search",
+    "realtek audio console", "operationstatuswindow", "shell_secondarytraywnd",
+    "smartgrid settings", "smartgrid layout manager", "tk"
+)
+_BAD_TITLE_RE = re.compile("|".join(map(re.escape, BAD_TITLES)))
+
+BAD_CLASSES = frozenset((
+    "chrome_renderwidgethosthwnd", "mozillawindowclass", "operationstatuswindow",
+    "windows.ui.core.corewindow", "foregroundstaging", "workerw", "progman",
+    "shell_traywnd", "realtimedisplay", "credential dialog xaml host",
+    "multitaskingviewframe", "taskswitcherwnd", "xamlexplorerhostislandwindow",
+    "#32770", "windows.ui.popupwindowclass", "popuphostwindow",
+    "microsoft.ui.content.popupwindowsitebridge", "notepadshellexperiencehost",
+    "trectanglecapture", "tk", "toplevel"
+))
+
+def is_useful_window(title, class_name="", hwnd=None, pid_map=None):
     """Filter out overlays, PIPs, taskbar, notifications, etc."""
     if not title:
         return False
 
-    title_lower = title.lower()
-    class_lower = class_name.lower() if class_name else ""
+    # Hard exclude by class name (hashed lookup, cheapest test first)
+    if class_name and class_name.lower() in BAD_CLASSES:
+        return False
+
+    # Hard exclude by title (one regex pass instead of a substring scan per entry)
+    if _BAD_TITLE_RE.search(title.lower()):
+        return False
 
-    # Special case: Microsoft Teams - exclude tiny toasts only
+    # Special case: Microsoft Teams - exclude tiny toasts only (process lookup last)
     if hwnd:
-        process_name = get_process_name(hwnd)
+        process_name = get_process_name(hwnd, pid_map)
         if process_name == "ms-teams.exe":
             w, h = get_window_size(hwnd)
             if w < TEAMS_TOAST_MAX_WIDTH and h < TEAMS_TOAST_MAX_HEIGHT:
@@ -252,52 +770,19 @@ def is_useful_window(title, class_name="", hwnd=None):
             if h < 200:
                 return False
 
-    # Hard exclude by title
-    bad_titles = [
-        "zscaler", "spotify", "discord", "steam", "call", "meeting", "join", "incoming call",
-        "obs", "streamlabs", "twitch studio", "nvidia overlay", "geforce experience",
-        "shadowplay", "radeon software", "amd relive", "rainmeter", "wallpaper engine",
-        "lively wallpaper", "msi afterburner", "rtss", "rivatuner", "hwinfo", "hwmonitor",
-        "displayfusion", "actual window", "aquasnap", "powertoys", "fancyzones",
-        "picture in picture", "pip", "miniplayer", "mini player", "youtube music",
-        "vlc media player", "media player classic", "battle.net", "origin", "epic games",
-        "gog galaxy", "uplay", "ubisoft connect", "ea app", "game bar", "xbox",
-        "notification", "toast", "popup", "tooltip", "splash", "alert", "flyout",
-        "volume control", "brightness", "program manager", "start", "cortana", "search",
-        "realtek audio console", "operationstatuswindow", "shell_secondarytraywnd",
-        "smartgrid settings", "smartgrid layout manager", "tk"
-    ]
-
-    if any(bad in title_lower for bad in bad_titles):
-        return False
-
-    # Hard exclude by class name
-    bad_classes = [
-        "chrome_renderwidgethosthwnd", "mozillawindowclass", "operationstatuswindow",
-        "windows.ui.core.corewindow", "foregroundstaging", "workerw", "progman",
-        "shell_traywnd", "realtimedisplay", "credential dialog xaml host",
-        "multitaskingviewframe", "taskswitcherwnd", "xamlexplorerhostislandwindow",
-        "#32770", "windows.ui.popupwindowclass", "popuphostwindow",
-        "microsoft.ui.content.popupwindowsitebridge", "notepadshellexperiencehost",
-        "trectanglecapture", "tk", "toplevel" 
-    ]
-
-    if class_lower in bad_classes:
-        return False
-
     return True
 
 def get_window_class(hwnd):
     """Return window class name."""
     try:
-        buf = ctypes.create_unicode_buffer(256)
-        user32.GetClassNameW(hwnd, buf, 256)
-        return buf.value
+        buf = text_buffer()
+        return buf[:user32.GetClassNameW(hwnd, buf, 256)]
     except Exception:
         return ""
 
+@functools.lru_cache(maxsize=None)
 def create_icon_image():
-    """Create SmartGrid icon (green square with white grid)"""
+    """Create SmartGrid icon (green square with white grid), rendered once and shared"""
     width, height = 64, 64
     image = Image.new('RGB', (width, height), (0, 180, 0))
     dc = ImageDraw.Draw(image)
@@ -312,6 +797,73 @@ def create_icon_image():
     
     return image
 
+def ease_progress(t, effect="smoothstep"):
+    """Map linear progress t in [0, 1] through the named easing curve."""
+    if effect == "linear":
+        ease = t
+    elif effect == "ease_in":
+        ease = t ** 3
+    elif effect == "ease_in_out":
+        ease = 0.5 * (1.0 - math.cos(math.pi * t))
+    elif effect == "ease_out":
+        ease = 1.0 - ((1.0 - t) ** 3)
+    elif effect == "expo_out":
+        ease = 1.0 if t >= 1.0 else (1.0 - (2.0 ** (-10.0 * t)))
+    elif effect == "back_out":
+        c1 = 1.70158
+        c3 = c1 + 1.0
+        p = t - 1.0
+        ease = 1.0 + (c3 * (p ** 3)) + (c1 * (p ** 2))
+    elif effect == "elastic_out":
+        if t <= 0.0 or t >= 1.0:
+            ease = t
+        else:
+            c4 = (2.0 * math.pi) / 3.0
+            ease = (2.0 ** (-10.0 * t)) * math.sin((t * 10.0 - 0.75) * c4) + 1.0
+    elif effect == "spring_out":
+        if t <= 0.0:
+            ease = 0.0
+        elif t >= 1.0:
+            ease = 1.0
+        else:
+            # Damped spring response (distinct from elastic: less aggressive, more "physical").
+            zeta = 0.32
+            omega0 = 10.0
+            omega_d = omega0 * math.sqrt(max(1e-6, 1.0 - zeta * zeta))
+            expo = math.exp(-zeta * omega0 * t)
+            sin_scale = zeta / math.sqrt(max(1e-6, 1.0 - zeta * zeta))
+            ease = 1.0 - expo * (
+                math.cos(omega_d * t) + sin_scale * math.sin(omega_d * t)
+            )
+    elif effect == "crit_damped":
+        if t <= 0.0:
+            ease = 0.0
+        elif t >= 1.0:
+            ease = 1.0
+        else:
+            # Critically damped response: fast settle, no overshoot.
+            omega = 10.0
+            ease = 1.0 - math.exp(-omega * t) * (1.0 + omega * t)
+    elif effect == "bounce_out":
+        n1 = 7.5625
+        d1 = 2.75
+        if t < 1.0 / d1:
+            ease = n1 * t * t
+        elif t < 2.0 / d1:
+            p = t - 1.5 / d1
+            ease = n1 * p * p + 0.75
+        elif t < 2.5 / d1:
+            p = t - 2.25 / d1
+            ease = n1 * p * p + 0.9375
+        else:
+            p = t - 2.625 / d1
+            ease = n1 * p * p + 0.984375
+    elif effect == "arc_wave":
+        ease = 0.5 * (1.0 - math.cos(math.pi * t))
+    else:  # smoothstep (default)
+        ease = t * t * (3 - 2 * t)
+    return ease
+
 def animate_window_move(
     hwnd,
     target_x,
@@ -344,75 +896,20 @@ def animate_window_move(
         duration = max(0.0, float(duration))
         if duration <= 0.0:
             return False
-        # Number of frames
-        frames = max(1, int(duration * fps))
+        # Time-driven frames: progress follows the clock, so slow SetWindowPos
+        # calls drop frames instead of stretching the animation.
+        frame_dt = 1.0 / fps
+        start = time.perf_counter()
+        next_frame = start + frame_dt
         
         # Interpolation with easing
-        for i in range(1, frames + 1):
-            t = i / frames
-            if effect == "linear":
-                ease = t
-            elif effect == "ease_in":
-                ease = t ** 3
-            elif effect == "ease_in_out":
-                ease = 0.5 * (1.0 - math.cos(math.pi * t))
-            elif effect == "ease_out":
-                ease = 1.0 - ((1.0 - t) ** 3)
-            elif effect == "expo_out":
-                ease = 1.0 if t >= 1.0 else (1.0 - (2.0 ** (-10.0 * t)))
-            elif effect == "back_out":
-                c1 = 1.70158
-                c3 = c1 + 1.0
-                p = t - 1.0
-                ease = 1.0 + (c3 * (p ** 3)) + (c1 * (p ** 2))
-            elif effect == "elastic_out":
-                if t <= 0.0 or t >= 1.0:
-                    ease = t
-                else:
-                    c4 = (2.0 * math.pi) / 3.0
-                    ease = (2.0 ** (-10.0 * t)) * math.sin((t * 10.0 - 0.75) * c4) + 1.0
-            elif effect == "spring_out":
-                if t <= 0.0:
-                    ease = 0.0
-                elif t >= 1.0:
-                    ease = 1.0
-                else:
-                    # Damped spring response (distinct from elastic: less aggressive, more "physical").
-                    zeta = 0.32
-                    omega0 = 10.0
-                    omega_d = omega0 * math.sqrt(max(1e-6, 1.0 - zeta * zeta))
-                    expo = math.exp(-zeta * omega0 * t)
-                    sin_scale = zeta / math.sqrt(max(1e-6, 1.0 - zeta * zeta))
-                    ease = 1.0 - expo * (
-                        math.cos(omega_d * t) + sin_scale * math.sin(omega_d * t)
-                    )
-            elif effect == "crit_damped":
-                if t <= 0.0:
-                    ease = 0.0
-                elif t >= 1.0:
-                    ease = 1.0
-                else:
-                    # Critically damped response: fast settle, no overshoot.
-                    omega = 10.0
-                    ease = 1.0 - math.exp(-omega * t) * (1.0 + omega * t)
-            elif effect == "bounce_out":
-                n1 = 7.5625
-                d1 = 2.75
-                if t < 1.0 / d1:
-                    ease = n1 * t * t
-                elif t < 2.0 / d1:
-                    p = t - 1.5 / d1
-                    ease = n1 * p * p + 0.75
-                elif t < 2.5 / d1:
-                    p = t - 2.25 / d1
-                    ease = n1 * p * p + 0.9375
-                else:
-                    p = t - 2.625 / d1
-                    ease = n1 * p * p + 0.984375
-            elif effect == "arc_wave":
-                ease = 0.5 * (1.0 - math.cos(math.pi * t))
-            else:  # smoothstep (default)
-                ease = t * t * (3 - 2 * t)
+        while True:
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                precise_sleep(delay)
+            now = time.perf_counter()
+            t = min(1.0, (now - start) / duration)
+            ease = ease_progress(t, effect)
 
             x = start_x + (target_x - start_x) * ease
             y = start_y + (target_y - start_y) * ease
@@ -436,7 +933,100 @@ def animate_window_move(
                 SWP_NOZORDER | SWP_NOACTIVATE | SWP_NOSENDCHANGING
             )
             
-            time.sleep(1.0 / fps)
+            if t >= 1.0:
+                break
+            next_frame += frame_dt
+            if next_frame <= now:
+                # Fell behind: skip missed frames rather than bursting to catch up
+                next_frame = now + frame_dt
+        
+        return True
+    
+    except Exception as e:
+        log(f"[ANIM] Error: {e}")
+        return False
+
+def defer_window_positions(targets, flags):
+    """Apply [(hwnd, x, y, w, h), ...] outer rects in one DeferWindowPos transaction."""
+    if not targets:
+        return True
+    try:
+        hdwp = user32.BeginDeferWindowPos(len(targets))
+        if not hdwp:
+            return False
+        for hwnd, x, y, w, h in targets:
+            hdwp = user32.DeferWindowPos(hdwp, hwnd, None, int(x), int(y), int(w), int(h), flags)
+            if not hdwp:
+                # The system already released the batch
+                return False
+        return bool(user32.EndDeferWindowPos(hdwp))
+    except Exception as e:
+        log(f"[ERROR] defer_window_positions: {e}")
+        return False
+
+def animate_windows_move(targets, duration=ANIMATION_DURATION, fps=ANIMATION_FPS, effect="smoothstep"):
+    """Animate [(hwnd, x, y, w, h), ...] together: one ease per frame, one DeferWindowPos commit."""
+    try:
+        fps = max(1, int(fps))
+        duration = max(0.0, float(duration))
+        if duration <= 0.0 or not targets:
+            return False
+        
+        # Start rects + borders captured once; windows already in place are skipped
+        tracks = []
+        rect = wintypes.RECT()
+        for hwnd, target_x, target_y, target_w, target_h in targets:
+            if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+                continue
+            lb, tb, rb, bb = get_frame_borders(hwnd)
+            start_x = rect.left + lb
+            start_y = rect.top + tb
+            start_w = rect.right - rect.left - lb - rb
+            start_h = rect.bottom - rect.top - tb - bb
+            if (abs(start_x - target_x) < 5 and abs(start_y - target_y) < 5 and
+                abs(start_w - target_w) < 5 and abs(start_h - target_h) < 5):
+                continue
+            arc = 0.0
+            if effect == "arc_wave":
+                travel = math.hypot(target_x - start_x, target_y - start_y)
+                direction = -1.0 if target_y >= start_y else 1.0
+                arc = direction * max(16.0, min(90.0, travel * 0.12))
+            tracks.append((
+                hwnd, start_x - lb, start_y - tb, start_w + lb + rb, start_h + tb + bb,
+                target_x - start_x, target_y - start_y, target_w - start_w, target_h - start_h,
+                arc,
+            ))
+        if not tracks:
+            return False
+        
+        flags = SWP_NOZORDER | SWP_NOACTIVATE | SWP_NOSENDCHANGING
+        frame_dt = 1.0 / fps
+        start = time.perf_counter()
+        next_frame = start + frame_dt
+        
+        while True:
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                precise_sleep(delay)
+            now = time.perf_counter()
+            t = min(1.0, (now - start) / duration)
+            ease = ease_progress(t, effect)
+            wave = math.sin(math.pi * t)
+            
+            frame = [
+                (hwnd, int(ox + dx * ease), int(oy + dy * ease + arc * wave),
+                 int(ow + dw * ease), int(oh + dh * ease))
+                for hwnd, ox, oy, ow, oh, dx, dy, dw, dh, arc in tracks
+            ]
+            if not defer_window_positions(frame, flags):
+                for hwnd, ax, ay, aw, ah in frame:
+                    user32.SetWindowPos(hwnd, 0, ax, ay, aw, ah, flags)
+            
+            if t >= 1.0:
+                break
+            next_frame += frame_dt
+            if next_frame <= now:
+                next_frame = now + frame_dt
         
         return True
     
@@ -444,6 +1034,36 @@ def animate_window_move(
         log(f"[ANIM] Error: {e}")
         return False
 
+# ==============================================================================
+# DEBOUNCER & ACTION POOL (Coalesce / serialize deferred calls)
+# ==============================================================================
+
+class Debouncer:
+    """Collapse rapid call() bursts into one trailing-edge call."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timer = None
+    
+    def call(self, fn, delay=0.08, *args):
+        """(Re)schedule fn(*args) to run once, delay seconds after the last call."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, fn, args)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def cancel(self):
+        """Drop the pending call, if any."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+# Single worker: tray/hotkey actions that touch tiling run one at a time, in order
+ACTION_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sg-action")
+
 # ==============================================================================
 # LAYOUT ENGINE (Centralized layout calculations)
 # ==============================================================================
@@ -452,6 +1072,7 @@ class LayoutEngine:
     """Calculates window positions for different layout types."""
     
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def choose_layout(count):
         """Choose optimal layout based on window count."""
         if count == 1: return "full", None
@@ -466,15 +1087,25 @@ class LayoutEngine:
     @staticmethod
     def calculate_positions(monitor_rect, count, gap, edge_padding, layout=None, info=None):
         """
-        Calculate all window positions for a given layout.
-        Returns: (positions_list, grid_coords_list)
-            positions_list: [(x, y, w, h), ...]
-            grid_coords_list: [(col, row), ...]
+        Calculate all window positions for a given layout (memoized; shared, read-only).
+        Returns: (positions, grid_coords)
+            positions: ((x, y, w, h), ...)
+            grid_coords: ((col, row), ...)
         """
-        mon_x, mon_y, mon_w, mon_h = monitor_rect
-        
         if layout is None:
             layout, info = LayoutEngine.choose_layout(count)
+        if isinstance(info, list):
+            info = tuple(info)
+        
+        return LayoutEngine._plan_positions(
+            tuple(monitor_rect), count, gap, edge_padding, layout, info
+        )
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _plan_positions(monitor_rect, count, gap, edge_padding, layout, info):
+        """Pure layout arithmetic behind calculate_positions (memoized, returns tuples)."""
+        mon_x, mon_y, mon_w, mon_h = monitor_rect
         
         positions = []
         grid_coords = []
@@ -510,21 +1141,227 @@ class LayoutEngine:
             cell_w = (mon_w - 2*edge_padding - total_gaps_w) // cols
             cell_h = (mon_h - 2*edge_padding - total_gaps_h) // rows
             
-            for r in range(rows):
-                for c in range(cols):
-                    if len(positions) >= count:
-                        break
-                    x = mon_x + edge_padding + c * (cell_w + gap)
-                    y = mon_y + edge_padding + r * (cell_h + gap)
-                    positions.append((x, y, cell_w, cell_h))
-                    grid_coords.append((c, r))
+            # Column/row origins once, then only the cells actually filled
+            xs = [mon_x + edge_padding + c * (cell_w + gap) for c in range(cols)]
+            ys = [mon_y + edge_padding + r * (cell_h + gap) for r in range(rows)]
+            grid_coords = LayoutEngine._grid_cells(cols, rows)[:max(0, count)]
+            positions = [(xs[c], ys[r], cell_w, cell_h) for c, r in grid_coords]
+        
+        return tuple(positions), tuple(grid_coords)
+    
+    @staticmethod
+    def slot_maps(monitor_rect, count, gap, edge_padding, layout=None, info=None):
+        """
+        Memoized lookups over calculate_positions' plan (treat as read-only).
+        Returns: (grid_coords, pos_map, coord_order)
+            pos_map: {(col, row): (x, y, w, h)}
+            coord_order: {(col, row): index in grid_coords}
+        """
+        if layout is None:
+            layout, info = LayoutEngine.choose_layout(count)
+        if isinstance(info, list):
+            info = tuple(info)
+        return LayoutEngine._plan_maps(tuple(monitor_rect), count, gap, edge_padding, layout, info)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _plan_maps(monitor_rect, count, gap, edge_padding, layout, info):
+        positions, grid_coords = LayoutEngine._plan_positions(
+            monitor_rect, count, gap, edge_padding, layout, info
+        )
+        pos_map = dict(zip(grid_coords, positions))
+        coord_order = {coord: i for i, coord in enumerate(grid_coords)}
+        return grid_coords, pos_map, coord_order
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _grid_cells(cols, rows):
+        """Row-major (col, row) fill order for one grid shape, built once per shape."""
+        return tuple((c, r) for r in range(rows) for c in range(cols))
+    
+    @staticmethod
+    def make_hittest(monitor_rect, layout, info, gap, edge_padding):
+        """
+        Specialize the drop-target formulas of one layout for one monitor geometry.
+        Returns: cell_at(px, py) -> (col, row, x, y, w, h)
+        """
+        if layout == "grid":
+            cols, rows = info if info else (2, 2)
+            return LayoutEngine.make_grid_mapper(monitor_rect, cols, rows, gap, edge_padding)
+        
+        mon_x, mon_y, mon_w, mon_h = monitor_rect
+        left = mon_x + edge_padding
+        top = mon_y + edge_padding
+        inner_h = mon_h - 2*edge_padding
+        
+        if layout == "master_stack":
+            master_w = (mon_w - 2*edge_padding - gap) * 3 // 5
+            master_right = left + master_w + gap//2
+            stack_x = left + master_w + gap
+            sw = mon_w - 2*edge_padding - master_w - gap
+            sh = (inner_h - gap) // 2
+            mid = mon_y + mon_h // 2
+            master = (0, 0, left, top, master_w, inner_h)
+            stack = ((1, 0, stack_x, top, sw, sh), (1, 1, stack_x, top + sh + gap, sw, sh))
+            
+            def cell_at(px, py):
+                if px < master_right:
+                    return master
+                return stack[py >= mid]
+            return cell_at
+        
+        if layout == "side_by_side":
+            cw = (mon_w - 2*edge_padding - gap) // 2
+            split_x = mon_x + mon_w//2
+            halves = ((0, 0, left, top, cw, inner_h), (1, 0, left + cw + gap, top, cw, inner_h))
+            
+            def cell_at(px, py):
+                return halves[px >= split_x]
+            return cell_at
+        
+        # full
+        whole = (0, 0, left, top, mon_w - 2*edge_padding, inner_h)
+        return lambda px, py: whole
+    
+    @staticmethod
+    def make_grid_mapper(monitor_rect, cols, rows, gap, edge_padding):
+        """
+        Specialize the grid cell formulas for one monitor geometry.
+        Returns: cell_at(px, py) -> (col, row, x, y, w, h)
+        """
+        mon_x, mon_y, mon_w, mon_h = monitor_rect
+        cell_w = (mon_w - 2*edge_padding - gap*(cols-1)) // cols
+        cell_h = (mon_h - 2*edge_padding - gap*(rows-1)) // rows
+        origin_x = mon_x + edge_padding
+        origin_y = mon_y + edge_padding
+        step_x = cell_w + gap
+        step_y = cell_h + gap
+        last_col = cols - 1
+        last_row = rows - 1
+        
+        def cell_at(px, py):
+            col = min(max(0, (px - origin_x) // step_x), last_col)
+            row = min(max(0, (py - origin_y) // step_y), last_row)
+            return col, row, origin_x + col * step_x, origin_y + row * step_y, cell_w, cell_h
         
-        return positions, grid_coords
+        return cell_at
 
 # ==============================================================================
 # WINDOW MANAGER (Handles grid_state, borders, tiling)
 # ==============================================================================
 
+class GridState(dict):
+    """hwnd → (monitor_idx, col, row) dict that maintains per-monitor indexes."""
+    
+    def __init__(self):
+        super().__init__()
+        self._by_monitor = {}  # monitor_idx → set(hwnd)
+        self._extents = {}  # monitor_idx → (max_col, max_row), kept incrementally
+        self._by_pos = {}  # (monitor_idx, col, row) → set(hwnd)
+    
+    def _index_add(self, hwnd, pos):
+        mon, col, row = pos
+        self._by_monitor.setdefault(mon, set()).add(hwnd)
+        self._by_pos.setdefault((mon, col, row), set()).add(hwnd)
+        ext = self._extents.get(mon)
+        if ext is not None and (col > ext[0] or row > ext[1]):
+            self._extents[mon] = (max(ext[0], col), max(ext[1], row))
+    
+    def _index_remove(self, hwnd, pos):
+        mon, col, row = pos
+        hwnds = self._by_monitor.get(mon)
+        if hwnds is not None:
+            hwnds.discard(hwnd)
+            if not hwnds:
+                del self._by_monitor[mon]
+        occupants = self._by_pos.get((mon, col, row))
+        if occupants is not None:
+            occupants.discard(hwnd)
+            if not occupants:
+                del self._by_pos[(mon, col, row)]
+        ext = self._extents.get(mon)
+        # Only a window on the boundary can shrink the extents; rescan lazily then
+        if ext is not None and (col >= ext[0] or row >= ext[1]):
+            self._extents.pop(mon, None)
+    
+    def __setitem__(self, hwnd, pos):
+        old = dict.get(self, hwnd)
+        if old is not None:
+            self._index_remove(hwnd, old)
+        dict.__setitem__(self, hwnd, pos)
+        self._index_add(hwnd, pos)
+    
+    def __delitem__(self, hwnd):
+        pos = dict.pop(self, hwnd)
+        self._index_remove(hwnd, pos)
+    
+    def pop(self, hwnd, *default):
+        if hwnd in self:
+            pos = dict.pop(self, hwnd)
+            self._index_remove(hwnd, pos)
+            return pos
+        if default:
+            return default[0]
+        raise KeyError(hwnd)
+    
+    def popitem(self):
+        hwnd, pos = dict.popitem(self)
+        self._index_remove(hwnd, pos)
+        return hwnd, pos
+    
+    def setdefault(self, hwnd, pos=None):
+        if hwnd not in self:
+            self[hwnd] = pos
+        return dict.__getitem__(self, hwnd)
+    
+    def update(self, *args, **kwargs):
+        for hwnd, pos in dict(*args, **kwargs).items():
+            self[hwnd] = pos
+    
+    def clear(self):
+        dict.clear(self)
+        self._by_monitor.clear()
+        self._extents.clear()
+        self._by_pos.clear()
+    
+    def copy(self):
+        """Snapshot that keeps the per-monitor indexes (dict(grid) would drop them)."""
+        clone = GridState()
+        dict.update(clone, self)
+        clone._by_monitor = {mon: set(hwnds) for mon, hwnds in self._by_monitor.items()}
+        clone._extents = dict(self._extents)
+        clone._by_pos = {pos: set(hwnds) for pos, hwnds in self._by_pos.items()}
+        return clone
+    
+    def hwnds_on(self, monitor_idx):
+        """Return the (live, read-only) set of hwnds tiled on monitor_idx."""
+        return self._by_monitor.get(monitor_idx, frozenset())
+    
+    def hwnds_at(self, pos):
+        """Return the (live, read-only) set of hwnds occupying (monitor_idx, col, row)."""
+        return self._by_pos.get(tuple(pos), frozenset())
+    
+    def iter_mon(self, monitor_idx):
+        """Yield (hwnd, col, row) for windows tiled on monitor_idx."""
+        for hwnd in self._by_monitor.get(monitor_idx, ()):
+            _, c, r = dict.__getitem__(self, hwnd)
+            yield hwnd, c, r
+    
+    def extents(self, monitor_idx):
+        """Return (max_col, max_row) used on monitor_idx, (0, 0) when empty."""
+        ext = self._extents.get(monitor_idx)
+        if ext is None:
+            max_c = max_r = 0
+            for hwnd in self._by_monitor.get(monitor_idx, ()):
+                _, c, r = dict.__getitem__(self, hwnd)
+                if c > max_c:
+                    max_c = c
+                if r > max_r:
+                    max_r = r
+            ext = self._extents[monitor_idx] = (max_c, max_r)
+        return ext
+
+
 class WindowManager:
     """Manages window grid state, borders, and physical tiling."""
     
@@ -537,9 +1374,10 @@ class WindowManager:
         self.animation_effect = "crit_damped"
         self.tile_timeout = TILE_TIMEOUT
         self.max_tile_retries = MAX_TILE_RETRIES
+        self.tile_correction_loop = TILE_CORRECTION_LOOP
         
         # Window tracking
-        self.grid_state = {}  # hwnd → (monitor_idx, col, row)
+        self.grid_state = GridState()  # hwnd → (monitor_idx, col, row)
         self.minimized_windows = {}
         self.maximized_windows = {}
         self.override_windows = set()  # Floating windows
@@ -556,9 +1394,35 @@ class WindowManager:
         self.cache_ttl = CACHE_TTL
         self.last_cleanup_minimized_moved = 0
         
+        # Bumped on every physical tile (lets callers detect external moves)
+        self.tile_generation = 0
+        
+        # Per-window caches, invalidated by WinEvent hooks (see SmartGrid._on_win_event)
+        self.maxstate_cache = {}  # hwnd → bool
+        self.title_cache = {}  # hwnd → title (log lines only)
+        self.frame_border_cache = {}  # hwnd → ((w, h), borders, perf_counter stamp)
+        self.destroyed_hwnds = set()  # tracked hwnds reported destroyed, reaped by cleanup_windows
+        self.event_tracking = False
+        
+        # Visible-window index, patched per hwnd from WinEvent hooks
+        self.visible_map = {}  # hwnd → (hwnd, title, rect), EnumWindows order
+        self.visible_dirty = set()  # hwnds to re-check (filled by SmartGrid._on_win_event)
+        self._visible_key = None
+        self._visible_synced_at = 0.0
+        
+        # PID → image name snapshot, built lazily once per get_visible_windows pass
+        self._pid_scope = False
+        self._pid_name_cache = None
+        
         # Thread safety
         self.lock = threading.Lock()
     
+    def is_alive(self, hwnd):
+        """IsWindow for tracked hwnds, answered from destroy events while hooks run."""
+        if self.event_tracking:
+            return hwnd not in self.destroyed_hwnds
+        return bool(user32.IsWindow(hwnd))
+    
     def is_window_useful_cached(self, hwnd, title, class_name):
         """Cached version of is_useful_window to reduce overhead."""
         now = time.time()
@@ -567,74 +1431,179 @@ class WindowManager:
             if now - timestamp < self.cache_ttl:
                 return result
         
-        result = is_useful_window(title, class_name, hwnd)
+        result = is_useful_window(title, class_name, hwnd, self._pid_names())
         self.useful_cache[hwnd] = (now, result)
         return result
     
+    def _pid_names(self):
+        """Return the current pass's PID → name map (None outside get_visible_windows)."""
+        if not self._pid_scope:
+            return None
+        if self._pid_name_cache is None:
+            self._pid_name_cache = build_pid_name_map()
+        return self._pid_name_cache
+    
+    def is_window_maximized(self, hwnd):
+        """Return True if hwnd is maximized (cached while hooks track state changes)."""
+        if self.event_tracking:
+            cached = self.maxstate_cache.get(hwnd)
+            if cached is not None:
+                return cached
+        
+        maximized = get_window_state(hwnd) == 'maximized'
+        if self.event_tracking and hwnd:
+            self.maxstate_cache[hwnd] = maximized
+        return maximized
+    
+    def window_title(self, hwnd, max_len=60):
+        """Return window title for logging (cached while hooks track name changes)."""
+        title = self.title_cache.get(hwnd) if self.event_tracking else None
+        if title is None:
+            try:
+                title = get_window_title(hwnd)
+            except Exception:
+                title = ""
+            if self.event_tracking and hwnd:
+                self.title_cache[hwnd] = title
+        return title[:max_len]
+    
+    def frame_borders(self, hwnd, rect=None):
+        """Return get_frame_borders(hwnd), reused while the window size (rect) is unchanged.
+        Without WinEvent hooks nothing invalidates entries, so they also expire after
+        FRAME_BORDER_TTL."""
+        if rect is None:
+            rect, rect_ref = scratch_rect("borders")
+            if not user32.GetWindowRect(hwnd, rect_ref):
+                return get_frame_borders(hwnd)
+        size = (rect.right - rect.left, rect.bottom - rect.top)
+        now = time.perf_counter()
+        cache = self.frame_border_cache
+        cached = cache.get(hwnd)
+        if cached is not None and cached[0] == size and (
+                self.event_tracking or now - cached[2] < FRAME_BORDER_TTL):
+            return cached[1]
+        
+        borders = get_frame_borders(hwnd)
+        if hwnd:
+            if not self.event_tracking and len(cache) > 64:
+                # No destroy events to evict on: drop expired entries instead
+                for stale in [h for h, e in list(cache.items()) if now - e[2] >= FRAME_BORDER_TTL]:
+                    cache.pop(stale, None)
+            cache[hwnd] = (size, borders, now)
+        return borders
+    
+    def _visible_entry(self, hwnd, monitor_edges, overlay_hwnd):
+        """Return (hwnd, title, rect) if hwnd is a visible, tileable window, else None.
+        monitor_edges: [(left, top, right, bottom), ...] precomputed per pass."""
+        if not user32.IsWindowVisible(hwnd):
+            return None
+        
+        state = get_window_state(hwnd)
+        if self.event_tracking:
+            self.maxstate_cache[hwnd] = state == 'maximized'
+        if state in ('minimized', 'maximized', 'hidden'):
+            return None
+        
+        rect = wintypes.RECT()
+        if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+            return None
+        
+        w = rect.right - rect.left
+        h = rect.bottom - rect.top
+        
+        if w <= MIN_WINDOW_WIDTH or h <= MIN_WINDOW_HEIGHT:
+            return None
+        
+        title = get_window_title(hwnd)
+        class_name = get_window_class(hwnd)
+        if self.event_tracking:
+            self.title_cache[hwnd] = title
+        
+        if overlay_hwnd and hwnd == overlay_hwnd:
+            return None
+        
+        # Check override (float toggle): user intent already given, skip the process lookup
+        if hwnd in self.override_windows:
+            useful = not is_useful_window(title, class_name)
+        else:
+            useful = self.is_window_useful_cached(hwnd, title, class_name)
+        
+        if useful:
+            # Stop as soon as the on-screen share passes 15%
+            threshold = w * h * 0.15
+            left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+            overlap = 0
+            for ml, mt, mr, mb in monitor_edges:
+                # Common case: fully inside one monitor, no min/max arithmetic needed
+                if ml <= left and right <= mr and mt <= top and bottom <= mb:
+                    return hwnd, title, rect
+                ow = min(right, mr) - max(left, ml)
+                oh = min(bottom, mb) - max(top, mt)
+                if ow > 0 and oh > 0:
+                    overlap += ow * oh
+                    if overlap > threshold:
+                        return hwnd, title, rect
+        return None
+    
     def get_visible_windows(self, monitors, overlay_hwnd=None):
         """Enumerate visible, tileable windows."""
+        self._pid_scope = True
+        try:
+            return self._collect_visible_windows(monitors, overlay_hwnd)
+        finally:
+            self._pid_scope = False
+            self._pid_name_cache = None
+    
+    def _collect_visible_windows(self, monitors, overlay_hwnd):
+        key = (tuple(monitors), overlay_hwnd, frozenset(self.override_windows))
+        now = time.time()
+        monitor_edges = [(mx, my, mx + mw, my + mh) for mx, my, mw, mh in monitors]
+        
+        # Hooks active: re-check only the hwnds touched by window events (full
+        # rescan every VISIBLE_RECONCILE_INTERVAL catches missed events)
+        if (self.event_tracking and key == self._visible_key and
+                now - self._visible_synced_at < VISIBLE_RECONCILE_INTERVAL):
+            while self.visible_dirty:
+                try:
+                    hwnd = self.visible_dirty.pop()
+                except KeyError:
+                    break
+                try:
+                    entry = self._visible_entry(hwnd, monitor_edges, overlay_hwnd)
+                except Exception as e:
+                    log(f"[ERROR] visible window refresh failed: {e}")
+                    entry = None
+                if entry:
+                    self.visible_map[hwnd] = entry
+                else:
+                    self.visible_map.pop(hwnd, None)
+            return list(self.visible_map.values())
+        
+        # Events arriving during the rescan stay queued for the next call
+        self.visible_dirty.clear()
         windows = []
         
-        def enum(hwnd, _):
+        for hwnd in enum_top_level_windows():
             try:
-                if not user32.IsWindowVisible(hwnd):
-                    return True
-                
-                state = get_window_state(hwnd)
-                if state in ('minimized', 'maximized', 'hidden'):
-                    return True
-                
-                rect = wintypes.RECT()
-                if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
-                    return True
-                
-                w = rect.right - rect.left
-                h = rect.bottom - rect.top
-                
-                if w <= MIN_WINDOW_WIDTH or h <= MIN_WINDOW_HEIGHT:
-                    return True
-                
-                title_buf = ctypes.create_unicode_buffer(256)
-                user32.GetWindowTextW(hwnd, title_buf, 256)
-                title = title_buf.value or ""
-                class_name = win32gui.GetClassName(hwnd)
-                
-                if overlay_hwnd and hwnd == overlay_hwnd:
-                    return True
-                
-                # Check override (float toggle)
-                useful = self.is_window_useful_cached(hwnd, title, class_name)
-                if hwnd in self.override_windows:
-                    useful = not useful
-                
-                if useful:
-                    overlap = sum(
-                        max(0, min(rect.right, mx + mw) - max(rect.left, mx)) *
-                        max(0, min(rect.bottom, my + mh) - max(rect.top, my))
-                        for mx, my, mw, mh in monitors
-                    )
-                    if overlap > (w * h * 0.15):
-                        windows.append((hwnd, title, rect))
-            
+                entry = self._visible_entry(hwnd, monitor_edges, overlay_hwnd)
+                if entry:
+                    windows.append(entry)
             except Exception as e:
-                log(f"[ERROR] enum callback failed: {e}")
-            
-            return True
-        
-        try:
-            user32.EnumWindows(
-                ctypes.WINFUNCTYPE(ctypes.c_bool, wintypes.HWND, wintypes.LPARAM)(enum), 0
-            )
-        except Exception as e:
-            log(f"[ERROR] EnumWindows failed: {e}")
+                log(f"[ERROR] visible window check failed: {e}")
         
+        self.visible_map = {entry[0]: entry for entry in windows}
+        self._visible_key = key
+        self._visible_synced_at = now
         return windows
     
-    def cleanup_dead_windows(self):
-        """Remove dead windows from grid_state and override_windows."""
+    def cleanup_windows(self, include_ghosts=True):
+        """Fused dead + ghost scan over grid_state (one lock hold, one probe per hwnd).
+        Returns: (dead_count, ghost_count)"""
         dead_windows = []
+        ghost_windows = []
         minimized_moved = 0
         maximized_moved = 0
+        rect = wintypes.RECT()
         
         with self.lock:
             for hwnd in list(self.grid_state.keys()):
@@ -654,10 +1623,32 @@ class WindowManager:
                     self.grid_state.pop(hwnd, None)
                     maximized_moved += 1
                     continue
-                
-                if not user32.IsWindowVisible(hwnd):
+                if state != 'normal':
+                    # Hidden (or vanished between probes)
                     self.grid_state.pop(hwnd, None)
                     continue
+                
+                if not include_ghosts:
+                    continue
+                try:
+                    if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+                        self.grid_state.pop(hwnd, None)
+                        ghost_windows.append(hwnd)
+                        continue
+                    
+                    w = rect.right - rect.left
+                    h = rect.bottom - rect.top
+                    
+                    # Title only matters for tiny windows
+                    if (w < 50 or h < 50) and not get_window_title(hwnd).strip():
+                        log(f"[CLEAN] Ghost window: hwnd={hwnd} size={w}x{h}")
+                        self.grid_state.pop(hwnd, None)
+                        ghost_windows.append(hwnd)
+                
+                except Exception as e:
+                    log(f"[ERROR] cleanup_windows: {e}")
+                    self.grid_state.pop(hwnd, None)
+                    ghost_windows.append(hwnd)
 
             # Cleanup minimized/maximized caches for dead windows
             for hwnd in list(self.minimized_windows.keys()):
@@ -684,85 +1675,150 @@ class WindowManager:
             for hwnd in list(self.useful_cache.keys()):
                 if not user32.IsWindow(hwnd):
                     del self.useful_cache[hwnd]
+            for hwnd in list(_border_color_cache.keys()):
+                if not user32.IsWindow(hwnd):
+                    _border_color_cache.pop(hwnd, None)
             self.last_cleanup_minimized_moved = minimized_moved
+            # Reaped hwnds no longer need the destroy marker
+            self.destroyed_hwnds.difference_update(
+                [h for h in list(self.destroyed_hwnds) if h not in self.grid_state]
+            )
         
         if dead_windows:
             log(f"[CLEAN] Removed {len(dead_windows)} dead windows")
+        if ghost_windows:
+            log(f"[CLEAN] Removed {len(ghost_windows)} ghost windows")
         
-        return len(dead_windows)
+        return len(dead_windows), len(ghost_windows)
+    
+    def cleanup_dead_windows(self):
+        """Remove dead windows from grid_state and override_windows."""
+        return self.cleanup_windows(include_ghosts=False)[0]
     
     def cleanup_ghost_windows(self):
         """Remove ghost windows (zombie-like windows)."""
-        ghost_windows = []
-        
-        with self.lock:
-            for hwnd in list(self.grid_state.keys()):
-                if not user32.IsWindow(hwnd):
-                    continue
-                
-                try:
-                    title = win32gui.GetWindowText(hwnd)
-                    rect = wintypes.RECT()
-                    
-                    if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
-                        self.grid_state.pop(hwnd, None)
-                        ghost_windows.append(hwnd)
-                        continue
-                    
-                    w = rect.right - rect.left
-                    h = rect.bottom - rect.top
-                    
-                    if (not title or len(title.strip()) == 0) and (w < 50 or h < 50):
-                        log(f"[CLEAN] Ghost window: hwnd={hwnd} size={w}x{h}")
-                        self.grid_state.pop(hwnd, None)
-                        ghost_windows.append(hwnd)
-                
-                except Exception as e:
-                    log(f"[ERROR] cleanup_ghost_windows: {e}")
-                    self.grid_state.pop(hwnd, None)
-                    ghost_windows.append(hwnd)
-        
-        if ghost_windows:
-            log(f"[CLEAN] Removed {len(ghost_windows)} ghost windows")
-        
-        return len(ghost_windows)
+        return self.cleanup_windows()[1]
     
     def apply_border(self, hwnd, color):
         """Apply colored border and update tracking."""
         if not hwnd or not user32.IsWindow(hwnd):
             return
         
-        set_window_border(hwnd, color)
+        set_window_border(hwnd, color)
+        
+        if color == BORDER_COLOR_ACTIVE:  # Green = active
+            self.current_hwnd = hwnd
+        elif color == BORDER_COLOR_SWAP:  # Red = swap mode
+            self.selected_hwnd = hwnd
+    
+    def clear_all_borders(self):
+        """Remove every colored border we applied (untouched windows cost nothing)."""
+        for hwnd, color in list(_border_color_cache.items()):
+            if color is not None:
+                set_window_border(hwnd, None)
+    
+    def _prepare_tile(self, hwnd, restyled=None):
+        """Make hwnd resizable/restored before a move; False if it must be left alone.
+        restyled: list collecting hwnds whose style changed, for the caller to settle
+        and recalc in one go (None → done here)."""
+        # One style read answers visible/minimized/maximized (get_window_state costs four calls)
+        style = user32.GetWindowLongW(hwnd, GWL_STYLE)
+        if style & (WS_MINIMIZE | WS_MAXIMIZE):
+            return False
+        
+        if not (style & WS_THICKFRAME):
+            user32.SetWindowLongW(hwnd, GWL_STYLE, style | WS_THICKFRAME)
+            # Frame recalc only when the style actually changed
+            if restyled is not None:
+                restyled.append(hwnd)
+            else:
+                precise_sleep(0.012)
+                user32.SetWindowPos(hwnd, 0, 0, 0, 0, 0,
+                                    SWP_NOMOVE | SWP_NOSIZE | SWP_NOZORDER | SWP_NOACTIVATE | SWP_FRAMECHANGED)
+        elif style & WS_VISIBLE:
+            return True  # Untouched: cached frame borders still hold
+        
+        if not (style & WS_VISIBLE):
+            user32.ShowWindowAsync(hwnd, SW_RESTORE)
+            for _ in range(10):
+                style = user32.GetWindowLongW(hwnd, GWL_STYLE)
+                if (style & (WS_VISIBLE | WS_MINIMIZE | WS_MAXIMIZE)) == WS_VISIBLE:
+                    break
+                time.sleep(0.02)
+        # Style/restore changes can resize the invisible frame
+        self.frame_border_cache.pop(hwnd, None)
+        return True
+    
+    def animate_many(self, targets):
+        """Animate [(hwnd, x, y, w, h), ...] in a single shared frame loop."""
+        return animate_windows_move(
+            targets,
+            duration=self.animation_duration,
+            fps=self.animation_fps,
+            effect=self.animation_effect,
+        )
+    
+    def force_tile_batch(self, moves, animate=True):
+        """Tile [(hwnd, x, y, w, h), ...] with one DeferWindowPos commit for all windows."""
+        if not moves:
+            return
+        self.tile_generation += 1
+        
+        ready = []
+        restyled = []
+        for hwnd, x, y, w, h in moves:
+            try:
+                if self._prepare_tile(hwnd, restyled):
+                    ready.append((hwnd, x, y, w, h))
+            except Exception as e:
+                log(f"[ERROR] force_tile_batch prepare failed for hwnd={hwnd}: {e}")
+        if not ready:
+            return
+        
+        # One settle delay for every restyled window, then their frame recalcs
+        if restyled:
+            precise_sleep(0.012)
+            for hwnd in restyled:
+                user32.SetWindowPos(hwnd, 0, 0, 0, 0, 0,
+                                    SWP_NOMOVE | SWP_NOSIZE | SWP_NOZORDER | SWP_NOACTIVATE | SWP_FRAMECHANGED)
+        
+        if animate and self.animation_enabled:
+            self.animate_many(ready)
         
-        if color == BORDER_COLOR_ACTIVE:  # Green = active
-            self.current_hwnd = hwnd
-        elif color == BORDER_COLOR_SWAP:  # Red = swap mode
-            self.selected_hwnd = hwnd
+        # Exact final geometry for every window in a single transaction
+        flags = SWP_NOZORDER | SWP_NOACTIVATE | SWP_FRAMECHANGED | SWP_NOSENDCHANGING
+        targets = []
+        for hwnd, x, y, w, h in ready:
+            lb, tb, rb, bb = self.frame_borders(hwnd)
+            targets.append((hwnd, x - lb, y - tb, w + lb + rb, h + tb + bb))
+        if not defer_window_positions(targets, flags):
+            for hwnd, ax, ay, aw, ah in targets:
+                user32.SetWindowPos(hwnd, 0, int(ax), int(ay), int(aw), int(ah), flags)
+        
+        # Stubborn windows (min sizes, late frame changes) get the full retry path
+        precise_sleep(0.014)
+        rect = wintypes.RECT()
+        for hwnd, x, y, w, h in ready:
+            try:
+                if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+                    continue
+                lb, tb, rb, bb = self.frame_borders(hwnd, rect)
+                cur_w = rect.right - rect.left - lb - rb
+                cur_h = rect.bottom - rect.top - tb - bb
+                if abs(cur_w - w) > 6 or abs(cur_h - h) > 6:
+                    self.force_tile_resizable(hwnd, x, y, w, h, animate=False)
+            except Exception as e:
+                log(f"[ERROR] force_tile_batch verify failed for hwnd={hwnd}: {e}")
     
     def force_tile_resizable(self, hwnd, x, y, w, h, animate=True):
         """Move and resize window to exact coordinates, handling borders."""
         start_time = time.time()
+        self.tile_generation += 1
         
         try:
-            state = get_window_state(hwnd)
-            if state in ('minimized', 'maximized'):
+            if not self._prepare_tile(hwnd):
                 return
             
-            style = user32.GetWindowLongW(hwnd, GWL_STYLE)
-            if not (style & WS_MAXIMIZE):
-                user32.SetWindowLongW(hwnd, GWL_STYLE, (style | WS_THICKFRAME) & ~WS_MAXIMIZE)
-            
-            if state != 'normal':
-                user32.ShowWindowAsync(hwnd, SW_RESTORE)
-                for _ in range(10):
-                    if get_window_state(hwnd) == 'normal':
-                        break
-                    time.sleep(0.02)
-            
-            time.sleep(0.012)
-            user32.SetWindowPos(hwnd, 0, 0, 0, 0, 0,
-                                SWP_NOMOVE | SWP_NOSIZE | SWP_NOZORDER | SWP_NOACTIVATE | SWP_FRAMECHANGED)
-            
             if animate and self.animation_enabled:
                 animated = animate_window_move(
                     hwnd,
@@ -776,7 +1832,7 @@ class WindowManager:
                 )
                 if animated:
                     # Exact final position after animation
-                    lb, tb, rb, bb = get_frame_borders(hwnd)
+                    lb, tb, rb, bb = self.frame_borders(hwnd)
                     ax, ay = x - lb, y - tb
                     aw, ah = w + lb + rb, h + tb + bb
                     user32.SetWindowPos(hwnd, 0, int(ax), int(ay), int(aw), int(ah),
@@ -784,42 +1840,53 @@ class WindowManager:
                     return
             
             # Fallback: classic method without animation
-            lb, tb, rb, bb = get_frame_borders(hwnd)
+            lb, tb, rb, bb = self.frame_borders(hwnd)
             ax, ay = x - lb, y - tb
             aw, ah = w + lb + rb, h + tb + bb
             
             flags = SWP_NOZORDER | SWP_NOACTIVATE | SWP_FRAMECHANGED | SWP_NOSENDCHANGING
+            rect = wintypes.RECT()
             
-            for attempt in range(max(1, int(self.max_tile_retries))):
-                if time.time() - start_time > max(0.2, float(self.tile_timeout)):
-                    log(f"[WARN] Tile timeout for hwnd={hwnd}")
-                    break
-                
-                user32.SetWindowPos(hwnd, 0, int(ax), int(ay), int(aw), int(ah), flags)
-                time.sleep(0.014)
-                
-                lb2, tb2, rb2, bb2 = get_frame_borders(hwnd)
-                rect = wintypes.RECT()
+            def measure(fresh=False):
+                # fresh: a miss may come from a rescaled frame (move across monitors)
+                if fresh:
+                    self.frame_border_cache.pop(hwnd, None)
                 user32.GetWindowRect(hwnd, ctypes.byref(rect))
-                cur_w = rect.right - rect.left - lb2 - rb2
-                cur_h = rect.bottom - rect.top - tb2 - bb2
-                
-                if abs(cur_w - w) <= 6 and abs(cur_h - h) <= 6:
-                    break
-                
-                ax, ay = x - lb2, y - tb2
-                aw, ah = w + lb2 + rb2, h + tb2 + bb2
+                lb2, tb2, rb2, bb2 = self.frame_borders(hwnd, rect)
+                return (lb2, tb2, rb2, bb2,
+                        rect.right - rect.left - lb2 - rb2, rect.bottom - rect.top - tb2 - bb2)
+            
+            # Closed form from the known borders: one SetWindowPos + one verify
+            user32.SetWindowPos(hwnd, 0, int(ax), int(ay), int(aw), int(ah), flags)
+            precise_sleep(0.014)
+            lb2, tb2, rb2, bb2, cur_w, cur_h = measure()
+            
+            # Only windows that missed (DPI switch, min sizes, late frame changes) iterate
+            if self.tile_correction_loop:
+                for attempt in range(max(1, int(self.max_tile_retries)) - 1):
+                    if abs(cur_w - w) <= 6 and abs(cur_h - h) <= 6:
+                        break
+                    if time.time() - start_time > max(0.2, float(self.tile_timeout)):
+                        log(f"[WARN] Tile timeout for hwnd={hwnd}")
+                        break
+                    if attempt == 0:
+                        # First miss: the cached borders may be stale, re-read them
+                        lb2, tb2, rb2, bb2, cur_w, cur_h = measure(fresh=True)
+                        if abs(cur_w - w) <= 6 and abs(cur_h - h) <= 6:
+                            break
+                    
+                    ax, ay = x - lb2, y - tb2
+                    aw, ah = w + lb2 + rb2, h + tb2 + bb2
+                    user32.SetWindowPos(hwnd, 0, int(ax), int(ay), int(aw), int(ah), flags)
+                    precise_sleep(0.014)
+                    lb2, tb2, rb2, bb2, cur_w, cur_h = measure(fresh=True)
             
             user32.RedrawWindow(hwnd, None, None,
                                 win32con.RDW_FRAME | win32con.RDW_INVALIDATE | 
                                 win32con.RDW_UPDATENOW | win32con.RDW_ALLCHILDREN)
             
-            # Final size check
-            rect = wintypes.RECT()
-            user32.GetWindowRect(hwnd, ctypes.byref(rect))
-            lb, tb, rb, bb = get_frame_borders(hwnd)
-            final_w = rect.right - rect.left - lb - rb
-            final_h = rect.bottom - rect.top - tb - bb
+            # Final size check (reuses the last measurement)
+            final_w, final_h = cur_w, cur_h
             
             if abs(final_w - w) > 15 or abs(final_h - h) > 15:
                 title = win32gui.GetWindowText(hwnd)
@@ -854,6 +1921,8 @@ class SmartGrid:
         self.last_visible_count = 0
         self.last_retile_time = 0.0
         self.retile_debounce = RETILE_DEBOUNCE
+        self.retile_debouncer = Debouncer()
+        self.retile_generation = 0  # Bumped to invalidate pending debounced retiles
         self.last_known_count = 0
         self.layout_signature = {}
         self.layout_capacity = {}
@@ -888,9 +1957,19 @@ class SmartGrid:
         # Multi-monitor & workspaces
         self.monitors_cache = []
         self.current_monitor_index = 0
+        self._last_monitor_hit = 0  # Memo for _get_monitor_index_for_point
+        self._grid_mappers = {}  # (monitor_rect, layout, info, gap, edge_padding) → cell_at
+        self._last_resolve = None  # (source_hwnd, _resolve_drop result) of last preview frame
+        self._fg_hwnd = None  # Foreground hwnd pushed by EVENT_SYSTEM_FOREGROUND
         self.workspaces = {}
         self.current_workspace = {}
         
+        # Persisted slots: monitor topology → {(exe, class): [(mon, col, row), ...]}
+        self._saved_slots = {}
+        self._boot_slots = None  # Pending matches for the first retile after load_state
+        self._state_lock = threading.Lock()  # Serializes save_state (shared .tmp file, _saved_slots)
+        self.state_debouncer = Debouncer()  # Slot snapshots are written off the tiling thread
+        
         # Overlay & UI
         self.overlay_hwnd = None
         self.preview_rect = None
@@ -907,6 +1986,20 @@ class SmartGrid:
         self._tiling_lock = threading.RLock()
         self._stop_event = threading.Event()
         self.main_thread_id = win32api.GetCurrentThreadId()
+        self._last_applied_fingerprint = None  # (hash, tile_generation) of last apply_grid_state
+        
+        # WinEvent hooks (owned by _win_event_loop)
+        self._win_event_proc = None  # Keep reference to prevent GC
+        self._win_event_thread_id = None
+        self._monitor_wake = threading.Event()  # Set by _on_win_event to run monitor_loop now
+        self._monitor_hot_until = 0.0
+        
+        # Raw input mouse state (fed by _raw_mouse_input_loop)
+        self._raw_input_ready = False
+        self._raw_input_thread_id = None
+        self._raw_lbutton_down = False
+        self._mouse_event = threading.Event()
+        self._restore_event = threading.Event()  # Set on EVENT_SYSTEM_MINIMIZEEND
         
         # Initialize
         self._init_monitors()
@@ -1056,8 +2149,30 @@ class SmartGrid:
 
         px = int(x)
         py = int(y)
+
+        # Drag moves mostly stay on one monitor: try the last hit first
+        last = self._last_monitor_hit
+        if last < len(monitors):
+            mx, my, mw, mh = monitors[last]
+            if mx <= px < (mx + mw) and my <= py < (my + mh):
+                return last
+
+        # Let Windows resolve the monitor (handles gaps/taskbar areas), then
+        # map the HMONITOR back to our index if the cache still agrees
+        try:
+            hmon = user32.MonitorFromPoint(wintypes.POINT(px, py), MONITOR_DEFAULTTONEAREST)
+            hit = _hmonitor_to_idx.get(hmon)
+            if hit is not None:
+                idx, rect = hit
+                if idx < len(monitors) and monitors[idx] == rect:
+                    self._last_monitor_hit = idx
+                    return idx
+        except Exception:
+            pass
+
         for i, (mx, my, mw, mh) in enumerate(monitors):
             if mx <= px < (mx + mw) and my <= py < (my + mh):
+                self._last_monitor_hit = i
                 return i
 
         best_idx = 0
@@ -1075,6 +2190,17 @@ class SmartGrid:
                 best_idx = i
         return best_idx
 
+    def _get_hittest(self, monitor_rect, layout, info):
+        """Return cached LayoutEngine.make_hittest for this geometry."""
+        key = (tuple(monitor_rect), layout, info, self.gap, self.edge_padding)
+        mapper = self._grid_mappers.get(key)
+        if mapper is None:
+            if len(self._grid_mappers) > 64:
+                self._grid_mappers.clear()
+            mapper = LayoutEngine.make_hittest(monitor_rect, layout, info, self.gap, self.edge_padding)
+            self._grid_mappers[key] = mapper
+        return mapper
+
     def _get_monitor_index_for_rect(self, rect):
         """
         Return monitor index for a window rect.
@@ -1096,6 +2222,20 @@ class SmartGrid:
             except Exception:
                 return max(0, min(int(self.current_monitor_index), len(monitors) - 1))
 
+        # Windows resolves the largest-intersection monitor itself; map it back
+        # to our index while the cached enumeration still agrees
+        try:
+            hmon = user32.MonitorFromRect(
+                ctypes.byref(wintypes.RECT(left, top, right, bottom)), MONITOR_DEFAULTTONULL
+            )
+            hit = _hmonitor_to_idx.get(hmon) if hmon else None
+            if hit is not None:
+                idx, mon_rect = hit
+                if idx < len(monitors) and monitors[idx] == mon_rect:
+                    return idx
+        except Exception:
+            pass
+
         best_idx = -1
         best_area = 0
         for i, (mx, my, mw, mh) in enumerate(monitors):
@@ -1143,7 +2283,7 @@ class SmartGrid:
         with self.lock:
             minimized_snapshot = dict(self.window_mgr.minimized_windows)
             maximized_snapshot = dict(self.window_mgr.maximized_windows)
-            grid_snapshot = dict(self.window_mgr.grid_state)
+            grid_on_monitor = list(self.window_mgr.grid_state.hwnds_on(mon_idx))
             ws_snapshot = []
             for ws_map in self.workspaces.get(mon_idx, []):
                 ws_snapshot.append(dict(ws_map) if isinstance(ws_map, dict) else {})
@@ -1160,9 +2300,8 @@ class SmartGrid:
         for hwnd, (m, _c, _r) in maximized_snapshot.items():
             if m == mon_idx:
                 _add_choice(hwnd)
-        for hwnd, (m, _c, _r) in grid_snapshot.items():
-            if m == mon_idx:
-                _add_choice(hwnd)
+        for hwnd in grid_on_monitor:
+            _add_choice(hwnd)
 
         # Include windows referenced by any workspace map on this monitor.
         for ws_map in ws_snapshot:
@@ -1176,42 +2315,32 @@ class SmartGrid:
             _add_choice(hwnd)
 
         if not choices:
-            def enum(hwnd, _):
+            for hwnd in enum_top_level_windows():
                 try:
                     if not user32.IsWindowVisible(hwnd):
-                        return True
+                        continue
                     state = get_window_state(hwnd)
                     if state not in ("normal", "maximized"):
-                        return True
+                        continue
                     rect = wintypes.RECT()
                     if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
-                        return True
+                        continue
                     w = rect.right - rect.left
                     h = rect.bottom - rect.top
                     if w <= MIN_WINDOW_WIDTH or h <= MIN_WINDOW_HEIGHT:
-                        return True
+                        continue
                     if self._get_monitor_index_for_rect(rect) != mon_idx:
-                        return True
-                    title_buf = ctypes.create_unicode_buffer(256)
-                    user32.GetWindowTextW(hwnd, title_buf, 256)
-                    title = title_buf.value or ""
-                    class_name = win32gui.GetClassName(hwnd)
+                        continue
+                    title = get_window_title(hwnd)
+                    class_name = get_window_class(hwnd)
                     if not is_useful_window(title, class_name, hwnd):
-                        return True
+                        continue
                     if hwnd in seen:
-                        return True
+                        continue
                     choices.append((hwnd, self._build_window_descriptor(hwnd)))
                     seen.add(hwnd)
                 except Exception:
                     pass
-                return True
-
-            try:
-                user32.EnumWindows(
-                    ctypes.WINFUNCTYPE(ctypes.c_bool, wintypes.HWND, wintypes.LPARAM)(enum), 0
-                )
-            except Exception:
-                pass
 
         return choices
 
@@ -1241,7 +2370,7 @@ class SmartGrid:
 
         def _assignment_entry(hwnd, col, row):
             entry = {
-                "pos": (0, 0, 800, 600),
+                "pos": _DUMMY_POS,
                 "grid": (int(col), int(row)),
                 "state": "normal",
             }
@@ -1332,11 +2461,11 @@ class SmartGrid:
                         self.window_mgr.minimized_windows.pop(hwnd, None)
 
                 # Remove any non-selected windows from grid_state on this monitor.
-                for hwnd, (m, c, r) in list(self.window_mgr.grid_state.items()):
-                    if m == mon_idx and hwnd not in selected_hwnds:
+                for hwnd, c, r in list(self.window_mgr.grid_state.iter_mon(mon_idx)):
+                    if hwnd not in selected_hwnds:
                         self.window_mgr.grid_state.pop(hwnd, None)
                         if hwnd not in self.window_mgr.minimized_windows:
-                            self.window_mgr.minimized_windows[hwnd] = (m, c, r)
+                            self.window_mgr.minimized_windows[hwnd] = (mon_idx, c, r)
                         self.window_state_ws[hwnd] = active_ws
 
                 # Apply assigned slots.
@@ -1349,11 +2478,11 @@ class SmartGrid:
                 if 0 <= target_ws < len(ws_list):
                     ws_list[target_ws] = dict(workspace_layout)
 
-            for (col, row), hwnd in assignments.items():
-                if (col, row) in pos_map:
-                    x, y, w, h = pos_map[(col, row)]
-                    self.window_mgr.force_tile_resizable(hwnd, x, y, w, h)
-                    time.sleep(0.01)
+            self.window_mgr.force_tile_batch([
+                (hwnd,) + tuple(pos_map[(col, row)])
+                for (col, row), hwnd in assignments.items()
+                if (col, row) in pos_map
+            ])
 
         self.layout_signature[mon_idx] = (layout, info)
         self.layout_capacity[mon_idx] = capacity
@@ -1422,119 +2551,138 @@ class SmartGrid:
     # TILING LOGIC
     # ==========================================================================
     
-    def smart_tile_with_restore(self):
-        """Smart tiling that respects saved grid positions."""
-        with self._tiling_lock:
-            if time.time() < self.ignore_retile_until:
-                return
-            
-            # GLOBAL LOCK AT THE START
-            with self.lock:
-                self.ignore_retile_until = time.time() + 0.3
-                
-                # Cleanup
-                self.window_mgr.cleanup_dead_windows()
-                self._backfill_window_state_ws_locked()
-                self.window_mgr.cleanup_ghost_windows()
-            
-            # Get visible windows (no lock needed)
-            visible_windows = self.window_mgr.get_visible_windows(
-                self.monitors_cache, self.overlay_hwnd
-            )
-            
-            if not visible_windows:
-                log("[TILE] No windows detected.")
-                return
+    def smart_tile_with_restore(self, blocking=False):
+        """Smart tiling that respects saved grid positions.
+        
+        Returns False when another thread was mid-pass and a trailing retile was
+        queued instead; blocking=True waits for that pass and always runs this one.
+        """
+        # Another thread is mid-pass: queue one trailing pass instead of stacking
+        # duplicate retiles behind the lock (reentrant calls still proceed)
+        if not self._tiling_lock.acquire(blocking=blocking):
+            self.request_retile()
+            return False
+        try:
+            self._smart_tile_pass()
+        finally:
+            self._tiling_lock.release()
+        return True
+    
+    def _smart_tile_pass(self):
+        """One smart_tile_with_restore pass (caller holds _tiling_lock)."""
+        if time.time() < self.ignore_retile_until:
+            return
+        
+        # GLOBAL LOCK AT THE START
+        with self.lock:
+            self.ignore_retile_until = time.time() + 0.3
             
-            # Separate windows by monitor
-            wins_by_monitor = self._group_windows_by_monitor(visible_windows)
-
-            # Snapshot maximized windows AFTER grouping, so restored windows are not
-            # mistakenly treated as reserved slots.
-            with self.lock:
-                maximized_snapshot = dict(self.window_mgr.maximized_windows)
-                grid_snapshot = dict(self.window_mgr.grid_state)
+            # Cleanup (dead + ghost in one pass)
+            self.window_mgr.cleanup_windows()
+            self._backfill_window_state_ws_locked()
+        
+        # Get visible windows (no lock needed)
+        visible_windows = self.window_mgr.get_visible_windows(
+            self.monitors_cache, self.overlay_hwnd
+        )
+        
+        if not visible_windows:
+            log("[TILE] No windows detected.")
+            return
+        
+        # Separate windows by monitor
+        wins_by_monitor = self._group_windows_by_monitor(visible_windows)
 
-            reserved_slots_by_monitor = {}
-            for _hwnd, (m_idx, col, row) in maximized_snapshot.items():
-                reserved_slots_by_monitor.setdefault(m_idx, set()).add((col, row))
+        # Snapshot maximized windows AFTER grouping, so restored windows are not
+        # mistakenly treated as reserved slots.
+        with self.lock:
+            maximized_snapshot = dict(self.window_mgr.maximized_windows)
+            grid_snapshot = self.window_mgr.grid_state.copy()
 
-            # Process each monitor
-            new_grid = {}
-            auto_persist_monitors = set()
-            for mon_idx, windows in wins_by_monitor.items():
-                if mon_idx >= len(self.monitors_cache):
-                    continue
-                visible_count = len(windows)
-                if visible_count <= 0:
-                    continue
+        reserved_slots_by_monitor = {}
+        for _hwnd, (m_idx, col, row) in maximized_snapshot.items():
+            reserved_slots_by_monitor.setdefault(m_idx, set()).add((col, row))
 
-                # Hyprland-like behavior: when a window is maximized, keep its grid slot
-                # reserved so background retiles can't steal it.
-                reserved_slots = reserved_slots_by_monitor.get(mon_idx, set())
-                if reserved_slots:
-                    log(f"[TILE] Monitor {mon_idx+1}: reserved slots {sorted(reserved_slots)}")
-                    # Hard freeze: while a window is maximized on this monitor, do NOT move any
-                    # other tiled windows (Hyprland-like). Keep the previous grid_state for this
-                    # monitor, and skip tiling it entirely.
-                    kept = 0
-                    for hwnd, (m, c, r) in grid_snapshot.items():
-                        if m != mon_idx or not user32.IsWindow(hwnd):
-                            continue
-                        if get_window_state(hwnd) != 'normal':
-                            continue
-                        new_grid[hwnd] = (m, c, r)
-                        kept += 1
-                    log(f"[TILE] Monitor {mon_idx+1}: maximize freeze (kept {kept} windows)")
-                    continue
+        # Process each monitor
+        new_grid = {}
+        auto_persist_monitors = set()
+        for mon_idx, windows in wins_by_monitor.items():
+            if mon_idx >= len(self.monitors_cache):
+                continue
+            visible_count = len(windows)
+            if visible_count <= 0:
+                continue
 
-                effective_count = visible_count
+            # Hyprland-like behavior: when a window is maximized, keep its grid slot
+            # reserved so background retiles can't steal it.
+            reserved_slots = reserved_slots_by_monitor.get(mon_idx, set())
+            if reserved_slots:
+                log(f"[TILE] Monitor {mon_idx+1}: reserved slots {sorted(reserved_slots)}")
+                # Hard freeze: while a window is maximized on this monitor, do NOT move any
+                # other tiled windows (Hyprland-like). Keep the previous grid_state for this
+                # monitor, and skip tiling it entirely.
+                kept = 0
+                for hwnd, c, r in grid_snapshot.iter_mon(mon_idx):
+                    if not user32.IsWindow(hwnd):
+                        continue
+                    if get_window_state(hwnd) != 'normal':
+                        continue
+                    new_grid[hwnd] = (mon_idx, c, r)
+                    kept += 1
+                log(f"[TILE] Monitor {mon_idx+1}: maximize freeze (kept {kept} windows)")
+                continue
 
-                with self.lock:
-                    active_ws = self.current_workspace.get(mon_idx, 0)
+            effective_count = visible_count
 
-                prev_sig = self.layout_signature.get(mon_idx)
-                layout, info = self.layout_engine.choose_layout(effective_count)
-                capacity = self._layout_capacity(layout, info)
-                layout_changed = prev_sig is not None and prev_sig != (layout, info)
-                self.layout_signature[mon_idx] = (layout, info)
-                self.layout_capacity[mon_idx] = capacity
-                prev_ws_sig = self.workspace_layout_signature.get((mon_idx, active_ws))
-                prev_ws_sig_norm = None
-                if prev_ws_sig is not None:
-                    prev_ws_sig_norm = self._normalize_layout_signature(prev_ws_sig[0], prev_ws_sig[1])
-                new_ws_sig_norm = self._normalize_layout_signature(layout, info)
-                persisted_sig_changed = prev_ws_sig_norm != new_ws_sig_norm
-                self.workspace_layout_signature[(mon_idx, active_ws)] = (layout, info)
-                self._tile_monitor(
-                    mon_idx,
-                    windows,
-                    new_grid,
-                    layout,
-                    info,
-                    capacity,
-                    reserved_slots=reserved_slots,
-                    compact_after_restore=layout_changed,
-                )
-                # In AUTO mode, persist active layout profile immediately on topology/signature
-                # changes (AUTO strict: includes grow and shrink transitions).
-                if layout_changed or persisted_sig_changed:
-                    auto_persist_monitors.add(mon_idx)
-            
-            # Update grid_state with lock - ONLY ONCE
             with self.lock:
-                self.window_mgr.grid_state.clear()  # ← CLEAR BEFORE UPDATE
-                self.window_mgr.grid_state.update(new_grid)
+                active_ws = self.current_workspace.get(mon_idx, 0)
 
-            # Keep manager status in sync with runtime topology changes in AUTO mode.
-            # This avoids one-cycle "Draft" lag after layout transitions like full->side_by_side.
-            for mon_idx in sorted(auto_persist_monitors):
-                try:
-                    self.save_workspace(mon_idx, update_profiles="full")
-                except Exception as e:
-                    log(f"[AUTO-PERSIST] save_workspace failed for monitor {mon_idx+1}: {e}")
-            
-            time.sleep(0.06)
+            prev_sig = self.layout_signature.get(mon_idx)
+            layout, info = self.layout_engine.choose_layout(effective_count)
+            capacity = self._layout_capacity(layout, info)
+            layout_changed = prev_sig is not None and prev_sig != (layout, info)
+            self.layout_signature[mon_idx] = (layout, info)
+            self.layout_capacity[mon_idx] = capacity
+            prev_ws_sig = self.workspace_layout_signature.get((mon_idx, active_ws))
+            prev_ws_sig_norm = None
+            if prev_ws_sig is not None:
+                prev_ws_sig_norm = self._normalize_layout_signature(prev_ws_sig[0], prev_ws_sig[1])
+            new_ws_sig_norm = self._normalize_layout_signature(layout, info)
+            persisted_sig_changed = prev_ws_sig_norm != new_ws_sig_norm
+            self.workspace_layout_signature[(mon_idx, active_ws)] = (layout, info)
+            self._tile_monitor(
+                mon_idx,
+                windows,
+                new_grid,
+                layout,
+                info,
+                capacity,
+                reserved_slots=reserved_slots,
+                compact_after_restore=layout_changed,
+            )
+            # In AUTO mode, persist active layout profile immediately on topology/signature
+            # changes (AUTO strict: includes grow and shrink transitions).
+            if layout_changed or persisted_sig_changed:
+                auto_persist_monitors.add(mon_idx)
+        
+        # Update grid_state with lock - ONLY ONCE
+        with self.lock:
+            self.window_mgr.grid_state.clear()  # ← CLEAR BEFORE UPDATE
+            self.window_mgr.grid_state.update(new_grid)
+
+        # Keep manager status in sync with runtime topology changes in AUTO mode.
+        # This avoids one-cycle "Draft" lag after layout transitions like full->side_by_side.
+        for mon_idx in sorted(auto_persist_monitors):
+            try:
+                self.save_workspace(mon_idx, update_profiles="full")
+            except Exception as e:
+                log(f"[AUTO-PERSIST] save_workspace failed for monitor {mon_idx+1}: {e}")
+        
+        # Boot matches apply to the first pass only; later windows are genuinely new
+        self._boot_slots = None
+        self.state_debouncer.call(self.save_state, STATE_SLOTS_INTERVAL)
+        
+        precise_sleep(TILE_SETTLE)
     
     def _group_windows_by_monitor(self, visible_windows):
         """Group windows by their assigned monitor, preserving saved positions."""
@@ -1590,9 +2738,14 @@ class SmartGrid:
             elif hwnd in grid_snapshot:
                 mon_idx, col, row = grid_snapshot[hwnd]
             else:
-                # NEW WINDOW: use physical monitor
-                mon_idx = physical_mon_idx
-                col, row = 0, 0
+                # NEW WINDOW: slot from the previous session if it matches, else physical monitor
+                boot_slot = self._take_boot_slot(hwnd, win_class) if self._boot_slots else None
+                if boot_slot is not None:
+                    mon_idx, col, row = boot_slot
+                    log(f"[STATE] Restoring saved slot ({col},{row}) on monitor {mon_idx+1}: {title[:40]}")
+                else:
+                    mon_idx = physical_mon_idx
+                    col, row = 0, 0
             
             wins_by_monitor.setdefault(mon_idx, []).append(
                 (hwnd, title, rect, col, row, win_class)
@@ -1620,65 +2773,62 @@ class SmartGrid:
         reserved_slots = reserved_slots or set()
         log(f"\n[TILE] Monitor {mon_idx+1}: {visible_count}/{capacity} windows -> {layout} layout")
         
-        # Calculate positions
-        positions, grid_coords = self.layout_engine.calculate_positions(
+        # Calculate positions (memoized slot lookups, shared read-only)
+        grid_coords, pos_map, coord_order = self.layout_engine.slot_maps(
             monitor_rect, capacity, self.gap, self.edge_padding, layout, info
         )
-        
-        pos_map = dict(zip(grid_coords, positions))
+        placements = {}  # hwnd → (x, y, w, h), committed in one batch below
         
         # Phase 1: Restore saved positions
-        reserved_in_layout = {slot for slot in reserved_slots if slot in pos_map}
-        assigned = set(reserved_in_layout)
+        # Slot occupancy as a flat bytearray indexed like grid_coords
+        total = len(grid_coords)
+        taken = bytearray(total)
+        for slot in reserved_slots:
+            idx = coord_order.get(slot)
+            if idx is not None:
+                taken[idx] = 1
         unassigned_windows = []
         
         for hwnd, title, rect, saved_col, saved_row, win_class in windows:
             target_coords = (saved_col, saved_row)
             
             # CHECK IF COORDINATES ARE VALID
-            if (target_coords in pos_map and 
-                target_coords not in assigned and
-                saved_col < 10 and saved_row < 10):  # ← ADD VALIDATION
-                x, y, w, h = pos_map[target_coords]
-                self.window_mgr.force_tile_resizable(hwnd, x, y, w, h)
+            idx = coord_order.get(target_coords)
+            if idx is not None and (saved_col >= 10 or saved_row >= 10):
+                idx = None
+            if idx is not None and not taken[idx]:
+                placements[hwnd] = pos_map[target_coords]
                 new_grid[hwnd] = (mon_idx, saved_col, saved_row)
-                assigned.add(target_coords)
+                taken[idx] = 1
                 log(f"   ✓ RESTORED to ({saved_col},{saved_row}): {title[:50]} [{win_class}]")
-                time.sleep(0.015)
             else:
                 # Invalid or already occupied position
-                desired = target_coords if (target_coords in pos_map and saved_col < 10 and saved_row < 10) else None
+                desired = target_coords if idx is not None else None
                 unassigned_windows.append((hwnd, title, rect, desired, win_class))
         
         # Phase 2: Assign remaining windows
-        available_positions = [coord for coord in grid_coords if coord not in assigned]
-        coord_order = {coord: i for i, coord in enumerate(grid_coords)}
-        
         for hwnd, title, rect, desired, win_class in unassigned_windows:
-            if not available_positions:
+            first = taken.find(0)
+            if first < 0:
                 break
             
-            if desired and desired in pos_map:
-                col, row = min(
-                    available_positions,
-                    key=lambda coord: (
-                        abs(coord[0] - desired[0]) + abs(coord[1] - desired[1]),
-                        coord_order[coord],
-                    ),
+            if desired:
+                dc, dr = desired
+                idx = min(
+                    (i for i in range(first, total) if not taken[i]),
+                    key=lambda i: (abs(grid_coords[i][0] - dc) + abs(grid_coords[i][1] - dr), i),
                 )
             else:
-                col, row = available_positions[0]
+                idx = first
             
-            available_positions.remove((col, row))
-            x, y, w, h = pos_map[(col, row)]
-            self.window_mgr.force_tile_resizable(hwnd, x, y, w, h)
+            taken[idx] = 1
+            col, row = grid_coords[idx]
+            placements[hwnd] = pos_map[(col, row)]
             new_grid[hwnd] = (mon_idx, col, row)
             log(f"   → NEW position ({col},{row}): {title[:50]} [{win_class}]")
-            time.sleep(0.015)
 
         # Layout changed: keep restore-first behavior, then compact holes.
         if compact_after_restore:
-            coord_order = {coord: idx for idx, coord in enumerate(grid_coords)}
             tiled = []
             for hwnd, (m, c, r) in new_grid.items():
                 coord = (c, r)
@@ -1695,14 +2845,17 @@ class SmartGrid:
                     if old_coord == target_coord:
                         continue
 
-                    x, y, w, h = pos_map[target_coord]
-                    self.window_mgr.force_tile_resizable(hwnd, x, y, w, h)
+                    placements[hwnd] = pos_map[target_coord]
                     new_grid[hwnd] = (mon_idx, target_coord[0], target_coord[1])
                     log(
                         f"   ↻ COMPACT ({old_coord[0]},{old_coord[1]}) -> "
                         f"({target_coord[0]},{target_coord[1]})"
                     )
-                    time.sleep(0.01)
+        
+        # Final slots only (compaction never moves a window twice)
+        self.window_mgr.force_tile_batch(
+            [(hwnd, x, y, w, h) for hwnd, (x, y, w, h) in placements.items()]
+        )
 
     def _sync_window_state_changes(self):
         """Track min/max/restore state transitions for stable retile decisions."""
@@ -1728,8 +2881,8 @@ class SmartGrid:
                     # This allows restoring all windows to their exact pre-minimize slots if context matches.
                     snapshot_slots = {
                         h: (c, r)
-                        for h, (m, c, r) in self.window_mgr.grid_state.items()
-                        if m == mon and user32.IsWindow(h)
+                        for h, c, r in self.window_mgr.grid_state.iter_mon(mon)
+                        if user32.IsWindow(h)
                     }
                     self.minimize_restore_snapshots[hwnd] = {
                         "monitor": mon,
@@ -1845,8 +2998,8 @@ class SmartGrid:
     def _get_layout_count_for_monitor(self, mon_idx):
         count = 0
         with self.lock:
-            for hwnd, (m, _, _) in self.window_mgr.grid_state.items():
-                if m == mon_idx and user32.IsWindow(hwnd):
+            for hwnd in self.window_mgr.grid_state.hwnds_on(mon_idx):
+                if user32.IsWindow(hwnd):
                     count += 1
         if count <= 0:
             return 0
@@ -1882,11 +3035,11 @@ class SmartGrid:
 
     def _build_workspace_entry(self, hwnd, col, row, state="normal"):
         """Create a workspace map entry for hwnd with slot/state metadata."""
-        pos = (0, 0, 800, 600)
+        pos = _DUMMY_POS
         try:
             rect = wintypes.RECT()
             if user32.GetWindowRect(hwnd, ctypes.byref(rect)):
-                lb, tb, rb, bb = get_frame_borders(hwnd)
+                lb, tb, rb, bb = self.window_mgr.frame_borders(hwnd, rect)
                 pos = (
                     rect.left + lb,
                     rect.top + tb,
@@ -1956,7 +3109,7 @@ class SmartGrid:
         rect = wintypes.RECT()
         if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
             return None
-        lb, tb, rb, bb = get_frame_borders(hwnd)
+        lb, tb, rb, bb = self.window_mgr.frame_borders(hwnd, rect)
         return (
             rect.left + lb,
             rect.top + tb,
@@ -2072,21 +3225,23 @@ class SmartGrid:
                         continue
                     corrections_plan.append((hwnd, col, row, x, y, w, h))
 
-            corrections = 0
+            moves = []
             for hwnd, col, row, x, y, w, h in corrections_plan:
                 if not user32.IsWindow(hwnd):
                     continue
                 if get_window_state(hwnd) != "normal":
                     continue
-                self.window_mgr.force_tile_resizable(hwnd, x, y, w, h, animate=False)
-                self._slot_guard_last_fix[hwnd] = time.time()
-                corrections += 1
-                try:
-                    title = win32gui.GetWindowText(hwnd)[:45]
-                except Exception:
-                    title = ""
-                log(f"[SLOT-GUARD] Re-clamp ({col},{row}) -> {title}")
-                time.sleep(0.004)
+                moves.append((hwnd, x, y, w, h))
+                if DEBUG:
+                    log(f"[SLOT-GUARD] Re-clamp ({col},{row}) -> {self.window_mgr.window_title(hwnd, 45)}")
+            
+            # All drifted windows in one DeferWindowPos commit
+            corrections = len(moves)
+            if moves:
+                self.window_mgr.force_tile_batch(moves, animate=False)
+                fixed_at = time.time()
+                for hwnd, _, _, _, _ in moves:
+                    self._slot_guard_last_fix[hwnd] = fixed_at
 
             if corrections:
                 for hwnd in list(self._slot_guard_last_fix.keys()):
@@ -2099,7 +3254,7 @@ class SmartGrid:
         """Place restored windows back into their saved slots."""
         with self._tiling_lock:
             with self.lock:
-                grid_snapshot = dict(self.window_mgr.grid_state)
+                grid_snapshot = self.window_mgr.grid_state.copy()
                 layout_sig_snapshot = dict(self.layout_signature)
                 ws_layout_sig_snapshot = dict(self.workspace_layout_signature)
                 current_ws_snapshot = dict(self.current_workspace)
@@ -2119,8 +3274,7 @@ class SmartGrid:
                     return False
 
                 current_mon_windows = {
-                    h for h, (m, _c, _r) in grid_snapshot.items()
-                    if m == mon_idx and user32.IsWindow(h)
+                    h for h in grid_snapshot.hwnds_on(mon_idx) if user32.IsWindow(h)
                 }
                 snapshot_windows = {h for h in slots.keys() if user32.IsWindow(h)}
                 if not snapshot_windows or current_mon_windows != snapshot_windows:
@@ -2165,11 +3319,9 @@ class SmartGrid:
                         self.window_mgr.grid_state[h] = (mon_idx, c, r)
                         grid_snapshot[h] = (mon_idx, c, r)
 
-                for h in ordered_hwnds:
-                    c, r = restored_slots[h]
-                    x, y, w, hh = pos_map[(c, r)]
-                    self.window_mgr.force_tile_resizable(h, x, y, w, hh)
-                    time.sleep(0.006)
+                self.window_mgr.force_tile_batch(
+                    [(h, *pos_map[restored_slots[h]]) for h in ordered_hwnds]
+                )
                 return True
 
             def _get_pos_map_for_exact_slot(mon_idx, col, row):
@@ -2188,8 +3340,7 @@ class SmartGrid:
                     candidates.append(ws_sig)
 
                 mon_window_count = sum(
-                    1 for h, (m, _c, _r) in grid_snapshot.items()
-                    if m == mon_idx and user32.IsWindow(h)
+                    1 for h in grid_snapshot.hwnds_on(mon_idx) if user32.IsWindow(h)
                 )
                 if mon_window_count > 0:
                     auto_sig = self.layout_engine.choose_layout(mon_window_count)
@@ -2226,7 +3377,7 @@ class SmartGrid:
                 rect = wintypes.RECT()
                 if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
                     return None
-                lb, tb, rb, bb = get_frame_borders(hwnd)
+                lb, tb, rb, bb = self.window_mgr.frame_borders(hwnd, rect)
                 return (
                     rect.left + lb,
                     rect.top + tb,
@@ -2253,8 +3404,8 @@ class SmartGrid:
 
                 mon_windows = [
                     (h, c, r)
-                    for h, (m, c, r) in grid_snapshot.items()
-                    if m == mon_idx and user32.IsWindow(h)
+                    for h, c, r in grid_snapshot.iter_mon(mon_idx)
+                    if user32.IsWindow(h)
                 ]
                 if not mon_windows:
                     return False
@@ -2317,11 +3468,9 @@ class SmartGrid:
                         self.window_mgr.grid_state[h] = (mon_idx, c, r)
                         grid_snapshot[h] = (mon_idx, c, r)
 
-                for h in ordered_hwnds:
-                    c, r = assigned[h]
-                    x, y, w, hh = pos_map[(c, r)]
-                    self.window_mgr.force_tile_resizable(h, x, y, w, hh)
-                    time.sleep(0.006)
+                self.window_mgr.force_tile_batch(
+                    [(h, *pos_map[assigned[h]]) for h in ordered_hwnds]
+                )
                 return True
 
             need_full_retile = False
@@ -2401,8 +3550,8 @@ class SmartGrid:
                 # "in place" cannot be guaranteed without overlaps -> do a single full retile.
                 mon_windows = [
                     (h, c, r)
-                    for h, (m, c, r) in grid_snapshot.items()
-                    if m == mon_idx and user32.IsWindow(h)
+                    for h, c, r in grid_snapshot.iter_mon(mon_idx)
+                    if user32.IsWindow(h)
                 ]
                 if len(mon_windows) > count:
                     need_full_retile = True
@@ -2415,12 +3564,11 @@ class SmartGrid:
                     for other_hwnd, other_col, other_row in mon_windows
                     if other_hwnd != hwnd and other_col == col and other_row == row
                 ]
+                moves = []
                 if conflicts:
-                    try:
-                        restored_title = win32gui.GetWindowText(hwnd)[:60]
-                    except Exception:
-                        restored_title = ""
-                    log(f"[RESTORE] Slot ({col},{row}) occupied for '{restored_title}' -> resolving")
+                    if DEBUG:
+                        restored_title = self.window_mgr.window_title(hwnd)
+                        log(f"[RESTORE] Slot ({col},{row}) occupied for '{restored_title}' -> resolving")
                     used_slots = {(c, r) for _, c, r in mon_windows}
                     free_slots = [coord for coord in grid_coords if coord not in used_slots]
                     if len(free_slots) < len(conflicts):
@@ -2428,31 +3576,30 @@ class SmartGrid:
                         need_full_retile = True
                         break
 
-                    # Move each conflicting window to a free slot.
+                    # Move each conflicting window to a free slot (committed together
+                    # with the restored window below).
                     for other_hwnd in conflicts:
                         new_slot = free_slots.pop(0)
-                        try:
-                            other_title = win32gui.GetWindowText(other_hwnd)[:60]
-                        except Exception:
-                            other_title = ""
-                        log(f"[RESTORE] Moving '{other_title}' -> {new_slot}")
+                        if DEBUG:
+                            other_title = self.window_mgr.window_title(other_hwnd)
+                            log(f"[RESTORE] Moving '{other_title}' -> {new_slot}")
                         with self.lock:
                             self.window_mgr.grid_state[other_hwnd] = (mon_idx, new_slot[0], new_slot[1])
                         grid_snapshot[other_hwnd] = (mon_idx, new_slot[0], new_slot[1])
-                        x2, y2, w2, h2 = pos_map[new_slot]
-                        self.window_mgr.force_tile_resizable(other_hwnd, x2, y2, w2, h2)
-                        time.sleep(0.01)
+                        moves.append((other_hwnd,) + tuple(pos_map[new_slot]))
 
                 # Finally, put the restored window back in its saved slot.
-                x, y, w, h = pos_map[target]
-                self.window_mgr.force_tile_resizable(hwnd, x, y, w, h)
+                moves.append((hwnd,) + tuple(pos_map[target]))
+                self.window_mgr.force_tile_batch(moves)
             if need_full_retile:
-                # Bypass the short "grace" window so the conflict is resolved immediately.
-                with self.lock:
-                    self.ignore_retile_until = 0.0
-                self.smart_tile_with_restore()
+                # Bypass the short "grace" window so the conflict is resolved immediately
+                # (blocking: the grid_state re-read below needs this pass to have run).
+                with self._tiling_lock:
+                    with self.lock:
+                        self.ignore_retile_until = 0.0
+                    self.smart_tile_with_restore(blocking=True)
                 with self.lock:
-                    grid_snapshot = dict(self.window_mgr.grid_state)
+                    grid_snapshot = self.window_mgr.grid_state.copy()
 
             for mon_idx, preferred in fallback_restore_slots.items():
                 if mon_idx in snapshot_restored_monitors:
@@ -2463,7 +3610,7 @@ class SmartGrid:
         """Fill earliest empty slots by moving windows from the end of the layout."""
         with self._tiling_lock:
             with self.lock:
-                grid_snapshot = dict(self.window_mgr.grid_state)
+                grid_snapshot = self.window_mgr.grid_state.copy()
                 layout_signature = dict(self.layout_signature)
                 layout_capacity = dict(self.layout_capacity)
 
@@ -2503,9 +3650,9 @@ class SmartGrid:
                 order_index = {coord: i for i, coord in enumerate(grid_coords)}
 
                 slot_to_hwnd = {}
-                for hwnd, (m, col, row) in grid_snapshot.items():
+                for hwnd, col, row in grid_snapshot.iter_mon(mon_idx):
                     coord = (col, row)
-                    if m != mon_idx or coord not in pos_map:
+                    if coord not in pos_map:
                         continue
                     if not user32.IsWindow(hwnd):
                         continue
@@ -2524,6 +3671,7 @@ class SmartGrid:
 
                 empty_indices.sort()
                 filled_indices = sorted(order_index[coord] for coord in slot_to_hwnd.keys())
+                moves = {}  # hwnd → final slot rect, committed in one batch
 
                 while empty_indices and filled_indices and filled_indices[-1] > empty_indices[0]:
                     donor_idx = filled_indices.pop(-1)
@@ -2533,13 +3681,16 @@ class SmartGrid:
                     target_coord = grid_coords[target_idx]
                     hwnd = slot_to_hwnd.pop(donor_coord)
 
-                    x, y, w, h = pos_map[target_coord]
-                    self.window_mgr.force_tile_resizable(hwnd, x, y, w, h)
+                    moves[hwnd] = pos_map[target_coord]
                     with self.lock:
                         self.window_mgr.grid_state[hwnd] = (mon_idx, target_coord[0], target_coord[1])
                     slot_to_hwnd[target_coord] = hwnd
                     bisect.insort(filled_indices, target_idx)
 
+                self.window_mgr.force_tile_batch(
+                    [(hwnd, x, y, w, h) for hwnd, (x, y, w, h) in moves.items()]
+                )
+
     def _compact_grid_after_close(self):
         """Compact grid after a window closes (hybrid layout change)."""
         self._compact_grid_after_minimize()
@@ -2602,15 +3753,20 @@ class SmartGrid:
 
         moved = []
         touched_monitors = set()
+        # Loop-invariant lookups bound once; liveness comes from destroy events
+        # while hooks run, and one scratch RECT serves every window
+        is_alive = self.window_mgr.is_alive
+        get_rect = user32.GetWindowRect
+        monitor_for_rect = self._get_monitor_index_for_rect
+        rect, rect_ref = scratch_rect()
         for hwnd, (mon_idx, col, row) in grid_snapshot:
-            if not user32.IsWindow(hwnd):
+            if not is_alive(hwnd):
                 continue
             if get_window_state(hwnd) != "normal":
                 continue
-            rect = wintypes.RECT()
-            if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+            if not get_rect(hwnd, rect_ref):
                 continue
-            physical_mon = self._get_monitor_index_for_rect(rect)
+            physical_mon = monitor_for_rect(rect)
             if physical_mon != mon_idx:
                 moved.append((hwnd, mon_idx, physical_mon, col, row))
                 touched_monitors.add(mon_idx)
@@ -2643,17 +3799,23 @@ class SmartGrid:
         self.smart_tile_with_restore()
         return True
     
-    def apply_grid_state(self):
-        """Reapply all saved grid positions physically."""
+    def apply_grid_state(self, only_hwnd=None):
+        """Reapply saved grid positions physically (all windows, or only_hwnd)."""
         with self._tiling_lock:
             with self.lock:
                 if not self.window_mgr.grid_state:
                     return
                 
-                # Remove dead windows
-                for hwnd in list(self.window_mgr.grid_state.keys()):
-                    if not user32.IsWindow(hwnd):
-                        self.window_mgr.grid_state.pop(hwnd, None)
+                # Remove dead windows (hooks active: only the reported destroys,
+                # no snapshot of every key)
+                grid = self.window_mgr.grid_state
+                is_alive = self.window_mgr.is_alive
+                if self.window_mgr.event_tracking:
+                    dead = [h for h in list(self.window_mgr.destroyed_hwnds) if h in grid]
+                else:
+                    dead = [h for h in grid if not user32.IsWindow(h)]
+                for hwnd in dead:
+                    grid.pop(hwnd, None)
                 
                 if not self.window_mgr.grid_state:
                     return
@@ -2663,35 +3825,80 @@ class SmartGrid:
                 gap = self.gap
                 edge_padding = self.edge_padding
             
+            if only_hwnd is not None and only_hwnd not in grid_snapshot:
+                return
+            
+            # Nothing changed since the last full apply and nobody tiled in between
+            fingerprint = None
+            if only_hwnd is None:
+                fingerprint = (
+                    hash((tuple(sorted(grid_snapshot.items())), tuple(monitors_snapshot), gap, edge_padding)),
+                    self.window_mgr.tile_generation
+                )
+                if fingerprint == self._last_applied_fingerprint:
+                    log("[APPLY] Grid unchanged, skipping")
+                    return
+            
             # Group by monitor (snapshot)
+            only_mon = grid_snapshot[only_hwnd][0] if only_hwnd is not None else None
             wins_by_mon = {}
             for hwnd, (mon_idx, col, row) in grid_snapshot.items():
-                if mon_idx >= len(monitors_snapshot) or not user32.IsWindow(hwnd):
+                if only_mon is not None and mon_idx != only_mon:
+                    continue
+                if mon_idx >= len(monitors_snapshot) or not is_alive(hwnd):
                     continue
                 wins_by_mon.setdefault(mon_idx, []).append((hwnd, col, row))
             
             # Process each monitor
+            moves = []
             for mon_idx, windows in wins_by_mon.items():
                 monitor_rect = monitors_snapshot[mon_idx]
                 count = len(windows)
                 layout, info = self.layout_engine.choose_layout(count)
                 
-                # Calculate positions
-                positions, coord_list = self.layout_engine.calculate_positions(
+                # Calculate positions (memoized slot lookup)
+                _coords, pos_dict, _order = self.layout_engine.slot_maps(
                     monitor_rect, count, gap, edge_padding, layout, info
                 )
                 
-                pos_dict = dict(zip(coord_list, positions))
-                
-                # Apply positions
+                # Collect positions
                 for hwnd, col, row in windows:
+                    if only_hwnd is not None and hwnd != only_hwnd:
+                        continue
                     key = (col, row)
                     if key in pos_dict:
-                        x, y, w, h = pos_dict[key]
-                        self.window_mgr.force_tile_resizable(hwnd, x, y, w, h)
-                        time.sleep(0.008)
+                        moves.append((hwnd,) + tuple(pos_dict[key]))
+            
+            # Apply all monitors in one batch
+            self.window_mgr.force_tile_batch(moves)
+            precise_sleep(TILE_SETTLE)
             
-            time.sleep(0.03)
+            if fingerprint is not None:
+                self._last_applied_fingerprint = (fingerprint[0], self.window_mgr.tile_generation)
+    
+    def request_retile(self, delay=0.12):
+        """Schedule one trailing smart_tile_with_restore, coalescing bursts."""
+        self.retile_generation += 1
+        self.retile_debouncer.call(self._run_debounced_retile, delay, self.retile_generation)
+    
+    def _run_debounced_retile(self, generation):
+        """Debouncer target: retile unless a newer request/switch superseded us."""
+        if generation != self.retile_generation or self._stop_event.is_set():
+            return
+        frozen = float('inf')
+        if self.ignore_retile_until == frozen:
+            # Settings/layout dialog open: check again later instead of tiling under it
+            self.retile_debouncer.call(self._run_debounced_retile, 0.5, generation)
+            return
+        try:
+            previous = self.ignore_retile_until
+            self.ignore_retile_until = 0.0
+            self.smart_tile_with_restore()
+            # Keep a small debounce window only (a freeze set meanwhile wins)
+            if self.ignore_retile_until != frozen:
+                self.ignore_retile_until = max(previous, time.time() + 0.35)
+        except Exception as e:
+            log(f"[ERROR] debounced retile: {e}")
     
     def force_immediate_retile(self):
         """Force immediate re-tile (bypass grace delays)."""
@@ -2699,7 +3906,6 @@ class SmartGrid:
             return
         
         log("\n[FORCE RETILE] Ctrl+Alt+R → Immediate full re-tile")
-        self.ignore_retile_until = 0
         self.last_visible_count = 0
         self.last_known_count = 0
         
@@ -2708,7 +3914,11 @@ class SmartGrid:
         except Exception:
             pass
         
-        self.smart_tile_with_restore()
+        # Wait out any running pass, then reset the grace window under the same lock
+        # so that pass can't re-arm it before ours starts
+        with self._tiling_lock:
+            self.ignore_retile_until = 0
+            self.smart_tile_with_restore(blocking=True)
     
     # ==========================================================================
     # BORDER MANAGEMENT
@@ -2722,14 +3932,21 @@ class SmartGrid:
                 set_window_border(self.window_mgr.selected_hwnd, BORDER_COLOR_SWAP)
             return
         
-        active = user32.GetForegroundWindow()
+        if self.window_mgr.event_tracking:
+            # Foreground pushed by the hook (cleared on its destroy): no
+            # cross-thread call per tick
+            active = self._fg_hwnd
+        else:
+            # GetGUIThreadInfo only reports a live active hwnd, so no IsWindow re-check
+            snapshot = foreground_snapshot()
+            active = snapshot[0] if snapshot else None
         
         # Get atomic copy of grid_state
         with self.lock:
             is_tiled = active in self.window_mgr.grid_state
         
         # Active window is tiled → green border
-        if is_tiled and user32.IsWindow(active):
+        if is_tiled:
             self.window_mgr.last_active_hwnd = active
             
             if self.window_mgr.current_hwnd != active:
@@ -2739,6 +3956,7 @@ class SmartGrid:
                 self.window_mgr.apply_border(active, BORDER_COLOR_ACTIVE)
                 self.window_mgr.current_hwnd = active
             else:
+                # Unchanged active window: a border-cache compare, no syscall
                 set_window_border(self.window_mgr.current_hwnd, BORDER_COLOR_ACTIVE)
             
             return
@@ -2761,7 +3979,9 @@ class SmartGrid:
     def enter_swap_mode(self):
         """Enter swap mode: red border + arrow keys."""
         self.swap_mode_lock = True
-        time.sleep(0.25)
+        # Barrier: let an in-flight tiling pass finish instead of sleeping
+        with self._tiling_lock:
+            pass
         
         # Get atomic check
         with self.lock:
@@ -2769,6 +3989,8 @@ class SmartGrid:
 
         # Force quick update if grid_state is empty
         if grid_empty:
+            # Seed positions only: with hooks running this re-checks just the dirty
+            # hwnds of the visible index (no full EnumWindows pass)
             visible_windows = self.window_mgr.get_visible_windows(
                 self.monitors_cache, self.overlay_hwnd
             )
@@ -2812,13 +4034,14 @@ class SmartGrid:
         
         # Get smart selection with lock
         candidate = None
+        fg = self.foreground_hwnd()
         with self.lock:
             if (self.window_mgr.last_active_hwnd and 
                 user32.IsWindow(self.window_mgr.last_active_hwnd) and 
                 self.window_mgr.last_active_hwnd in self.window_mgr.grid_state):
                 candidate = self.window_mgr.last_active_hwnd
-            elif user32.GetForegroundWindow() in self.window_mgr.grid_state:
-                candidate = user32.GetForegroundWindow()
+            elif fg in self.window_mgr.grid_state:
+                candidate = fg
             else:
                 candidate = next(iter(self.window_mgr.grid_state.keys()), None)
         
@@ -2831,7 +4054,7 @@ class SmartGrid:
         time.sleep(0.05)
         set_window_border(self.window_mgr.selected_hwnd, BORDER_COLOR_SWAP)
         
-        title = win32gui.GetWindowText(self.window_mgr.selected_hwnd)[:50]
+        title = self.window_mgr.window_title(self.window_mgr.selected_hwnd, 50) if DEBUG else ""
         log(f"\n[SWAP] ✓ Activated - Selected: '{title}'")
         log("━" * 60)
         log("  DIRECT SWAP with arrow keys:")
@@ -2845,6 +4068,7 @@ class SmartGrid:
     
     def navigate_swap(self, direction):
         """Handle arrow key in swap mode."""
+        # Fed by WM_HOTKEY from message_loop (pump runs without TranslateMessage)
         if not self.swap_mode_lock or not self.window_mgr.selected_hwnd:
             log("[SWAP] Mode not active or no window selected")
             return
@@ -2854,13 +4078,11 @@ class SmartGrid:
         
         if target:
             if self._swap_windows(self.window_mgr.selected_hwnd, target):
-                time.sleep(0.04)
-                set_window_border(self.window_mgr.selected_hwnd, None)
-                time.sleep(0.04)
-                set_window_border(self.window_mgr.selected_hwnd, BORDER_COLOR_SWAP)
+                # Single repaint at the new position
+                set_window_border(self.window_mgr.selected_hwnd, BORDER_COLOR_SWAP, force_redraw=True)
                 
-                title = win32gui.GetWindowText(self.window_mgr.selected_hwnd)[:50]
-                log(f"[SWAP] ✓ '{title}' swapped {direction}")
+                if DEBUG:
+                    log(f"[SWAP] ✓ '{self.window_mgr.window_title(self.window_mgr.selected_hwnd, 50)}' swapped {direction}")
                 user32.SetForegroundWindow(self.window_mgr.selected_hwnd)
             else:
                 log(f"[SWAP] ✗ Swap failed")
@@ -2875,68 +4097,64 @@ class SmartGrid:
             if from_hwnd not in self.window_mgr.grid_state:
                 return None
             
-            mon_idx = self.window_mgr.grid_state[from_hwnd][0]
+            mon_idx, from_col, from_row = self.window_mgr.grid_state[from_hwnd]
             
             # Copy the list of windows from the same monitor
+            grid = self.window_mgr.grid_state
+            count = len(grid.hwnds_on(mon_idx))
             windows_snapshot = [
-                (hwnd, mon, col, row) 
-                for hwnd, (mon, col, row) in self.window_mgr.grid_state.items()
-                if hwnd != from_hwnd and mon == mon_idx and user32.IsWindow(hwnd)
+                (hwnd,) + grid[hwnd]
+                for hwnd in grid.hwnds_on(mon_idx)
+                if hwnd != from_hwnd and self.window_mgr.is_alive(hwnd)
             ]
+            monitor_rect = (self.monitors_cache[mon_idx]
+                            if mon_idx < len(self.monitors_cache) else None)
+            sig = self.layout_signature.get(mon_idx)
+            capacity = self.layout_capacity.get(mon_idx, 0)
+            gap = self.gap
+            edge_padding = self.edge_padding
         
         try:
-            from_rect = wintypes.RECT()
-            if not user32.GetWindowRect(from_hwnd, ctypes.byref(from_rect)):
-                return None
+            # Slot rects come from the (memoized) layout plan instead of one
+            # GetWindowRect per candidate; unplanned slots fall back to the live rect
+            slot_rects = {}
+            if monitor_rect is not None:
+                layout, info = sig if sig is not None else self.layout_engine.choose_layout(count)
+                if capacity <= 0:
+                    capacity = self._layout_capacity(layout, info)
+                positions, coords = self.layout_engine.calculate_positions(
+                    monitor_rect, max(capacity, count), gap, edge_padding, layout, info
+                )
+                slot_rects = {
+                    cell: (x, y, x + w, y + h) for cell, (x, y, w, h) in zip(coords, positions)
+                }
             
-            fx1, fy1 = from_rect.left, from_rect.top
-            fx2, fy2 = from_rect.right, from_rect.bottom
-            fcx, fcy = (fx1 + fx2) // 2, (fy1 + fy2) // 2
-            from_width = fx2 - fx1
-            from_height = fy2 - fy1
+            rect, rect_ref = scratch_rect()
             
-            best_hwnd = None
-            best_distance = float('inf')
+            def rect_of(hwnd, col, row):
+                planned = slot_rects.get((col, row))
+                if planned is not None:
+                    return planned
+                if not user32.GetWindowRect(hwnd, rect_ref):
+                    return None
+                return (rect.left, rect.top, rect.right, rect.bottom)
             
-            # Iterate over the snapshot (no race condition)
-            for hwnd, m, _, _ in windows_snapshot:
-                rect = wintypes.RECT()
-                if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+            from_rect = rect_of(from_hwnd, from_col, from_row)
+            if from_rect is None:
+                return None
+            
+            # Flatten candidates into parallel lists (no race condition)
+            hwnds = []
+            rects = []
+            for hwnd, _, col, row in windows_snapshot:
+                cand = rect_of(hwnd, col, row)
+                if cand is None:
                     continue
-                
-                x1, y1, x2, y2 = rect.left, rect.top, rect.right, rect.bottom
-                cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
-                dx, dy = cx - fcx, cy - fcy
-                
-                # Direction filtering
-                if direction == "right" and dx <= 30: continue
-                if direction == "left" and dx >= -30: continue
-                if direction == "down" and dy <= 30: continue
-                if direction == "up" and dy >= -30: continue
-                
-                # Dynamic overlap threshold
-                overlap_x = max(0, min(fx2, x2) - max(fx1, x1))
-                overlap_y = max(0, min(fy2, y2) - max(fy1, y1))
-                
-                if direction in ("left", "right"):
-                    min_overlap_y = max(20, int(from_height * 0.20))
-                    if overlap_y < min_overlap_y:
-                        continue
-                else:
-                    min_overlap_x = max(20, int(from_width * 0.20))
-                    if overlap_x < min_overlap_x:
-                        continue
-                
-                # Euclidean distance
-                distance = (dx * dx) + (dy * dy)
-                alignment_bonus = (overlap_x if direction in ("up", "down") else overlap_y) * 10
-                score = distance - alignment_bonus
-                
-                if score < best_distance:
-                    best_distance = score
-                    best_hwnd = hwnd
+                hwnds.append(hwnd)
+                rects.append(cand)
             
-            return best_hwnd
+            best = find_in_direction(from_rect, rects, direction)
+            return hwnds[best] if best >= 0 else None
         
         except Exception as e:
             log(f"[ERROR] _find_window_in_direction: {e}")
@@ -2950,20 +4168,20 @@ class SmartGrid:
                     return False
             
             try:
-                set_window_border(hwnd1, None)
+                # hwnd1 keeps its border through the move (caller repaints it once);
+                # only the partner's stale border is cleared
                 set_window_border(hwnd2, None)
-                time.sleep(0.05)
                 
-                rect1 = wintypes.RECT()
-                rect2 = wintypes.RECT()
+                rect1, rect1_ref = scratch_rect(0)
+                rect2, rect2_ref = scratch_rect(1)
                 
-                if not user32.GetWindowRect(hwnd1, ctypes.byref(rect1)):
+                if not user32.GetWindowRect(hwnd1, rect1_ref):
                     return False
-                if not user32.GetWindowRect(hwnd2, ctypes.byref(rect2)):
+                if not user32.GetWindowRect(hwnd2, rect2_ref):
                     return False
                 
-                lb1, tb1, rb1, bb1 = get_frame_borders(hwnd1)
-                lb2, tb2, rb2, bb2 = get_frame_borders(hwnd2)
+                lb1, tb1, rb1, bb1 = self.window_mgr.frame_borders(hwnd1, rect1)
+                lb2, tb2, rb2, bb2 = self.window_mgr.frame_borders(hwnd2, rect2)
                 
                 x1 = rect1.left + lb1
                 y1 = rect1.top + tb1
@@ -2975,20 +4193,21 @@ class SmartGrid:
                 w2 = rect2.right - rect2.left - lb2 - rb2
                 h2 = rect2.bottom - rect2.top - tb2 - bb2
                 
-                title1 = win32gui.GetWindowText(hwnd1)[:40]
-                title2 = win32gui.GetWindowText(hwnd2)[:40]
-                log(f"[SWAP] '{title1}' ↔ '{title2}'")
+                if DEBUG:
+                    title1 = self.window_mgr.window_title(hwnd1, 40)
+                    title2 = self.window_mgr.window_title(hwnd2, 40)
+                    log(f"[SWAP] '{title1}' ↔ '{title2}'")
                 
                 # Swap in grid_state with lock
                 with self.lock:
                     self.window_mgr.grid_state[hwnd1], self.window_mgr.grid_state[hwnd2] = \
                         self.window_mgr.grid_state[hwnd2], self.window_mgr.grid_state[hwnd1]
                 
-                # Physical swap
-                self.window_mgr.force_tile_resizable(hwnd1, x2, y2, w2, h2)
-                time.sleep(0.04)
-                self.window_mgr.force_tile_resizable(hwnd2, x1, y1, w1, h1)
-                time.sleep(0.04)
+                # Physical swap: both moves land in one DeferWindowPos commit
+                self.window_mgr.force_tile_batch([
+                    (hwnd1, x2, y2, w2, h2),
+                    (hwnd2, x1, y1, w1, h1),
+                ])
                 
                 return True
             
@@ -3012,7 +4231,7 @@ class SmartGrid:
         self.window_mgr.current_hwnd = None
         
         # Restore green border with lock
-        active = user32.GetForegroundWindow()
+        active = self.foreground_hwnd()
         
         with self.lock:
             is_tiled = (active and 
@@ -3056,13 +4275,6 @@ class SmartGrid:
             
             try:
                 if msg == win32con.WM_PAINT:
-                    class PAINTSTRUCT(ctypes.Structure):
-                        _fields_ = [
-                            ("hdc", wintypes.HDC), ("fErase", wintypes.BOOL),
-                            ("rcPaint", wintypes.RECT), ("fRestore", wintypes.BOOL),
-                            ("fIncUpdate", wintypes.BOOL), ("rgbReserved", ctypes.c_char * 32)
-                        ]
-                    
                     ps = PAINTSTRUCT()
                     hdc = user32.BeginPaint(hwnd, ctypes.byref(ps))
                     
@@ -3146,16 +4358,26 @@ class SmartGrid:
         if not self.overlay_hwnd:
             self.create_overlay_window()
         
+        prev_rect = self.preview_rect
+        if prev_rect == (x, y, w, h):
+            # Same target cell as the last mouse move: nothing to move or paint
+            return
         self.preview_rect = (x, y, w, h)
         
+        # Layered content moves with the window: only repaint when size changes
+        # or the overlay was hidden
+        needs_paint = prev_rect is None or prev_rect[2:] != (w, h)
+        
         try:
             win32gui.SetWindowPos(
                 self.overlay_hwnd, win32con.HWND_TOPMOST,
                 int(x), int(y), int(w), int(h),
                 win32con.SWP_SHOWWINDOW | win32con.SWP_NOACTIVATE
             )
-            win32gui.InvalidateRect(self.overlay_hwnd, None, True)
-            win32gui.UpdateWindow(self.overlay_hwnd)
+            if needs_paint:
+                user32.RedrawWindow(self.overlay_hwnd, None, None,
+                                    win32con.RDW_INVALIDATE | win32con.RDW_ERASE |
+                                    win32con.RDW_UPDATENOW)
         except Exception as e:
             log(f"[ERROR] show_snap_preview: {e}")
     
@@ -3168,99 +4390,63 @@ class SmartGrid:
             except Exception:
                 pass
     
-    def calculate_target_rect(self, source_hwnd, cursor_pos):
-        """Calculate target snap rectangle for drag & drop."""
+    def _resolve_drop(self, source_hwnd, cursor_pos):
+        """
+        Resolve the drop target under the cursor for a dragged window.
+        Returns: (mon_idx, col, row, layout, info, (x, y, w, h)) or None
+        """
+        cx, cy = cursor_pos
+        
+        # Find target monitor
+        target_mon_idx = self._get_monitor_index_for_point(cx, cy)
         
-        # Atomic verification
+        monitor_rect = self.monitors_cache[target_mon_idx]
+        
+        # Atomic copy of window list
         with self.lock:
             if source_hwnd not in self.window_mgr.grid_state:
                 return None
-        
-        try:
-            cx, cy = cursor_pos
-            
-            # Find target monitor
-            target_mon_idx = 0
-            for i, (mx, my, mw, mh) in enumerate(self.monitors_cache):
-                if mx <= cx < mx + mw and my <= cy < my + mh:
-                    target_mon_idx = i
-                    break
-            
-            monitor_rect = self.monitors_cache[target_mon_idx]
-            mon_x, mon_y, mon_w, mon_h = monitor_rect
-            
-            # Atomic copy of window list
-            with self.lock:
-                wins_on_mon = [
-                    h for h, (m, _, _) in self.window_mgr.grid_state.items()
-                    if m == target_mon_idx and user32.IsWindow(h) and h != source_hwnd
-                ]
-                
-                # Also copy maxc and maxr to avoid a second iteration
-                maxc = max((c for h,(m,c,r) in self.window_mgr.grid_state.items() 
-                        if m == target_mon_idx), default=0)
-                maxr = max((r for h,(m,c,r) in self.window_mgr.grid_state.items() 
-                        if m == target_mon_idx), default=0)
-            
-            count = len(wins_on_mon) + 1
-            layout, info = self.layout_engine.choose_layout(count)
-            
-            # Calculate which cell cursor is in
-            x = y = w = h = 0
-            
-            if layout == "master_stack":
-                master_w = (mon_w - 2*self.edge_padding - self.gap) * 3 // 5
-                master_right = mon_x + self.edge_padding + master_w + self.gap//2
-                
-                if cx < master_right:
-                    x = mon_x + self.edge_padding
-                    y = mon_y + self.edge_padding
-                    w = master_w
-                    h = mon_h - 2*self.edge_padding
-                else:
-                    sw = mon_w - 2*self.edge_padding - master_w - self.gap
-                    sh = (mon_h - 2*self.edge_padding - self.gap) // 2
-                    mid = mon_y + mon_h // 2
-                    
-                    x = mon_x + self.edge_padding + master_w + self.gap
-                    y = mon_y + self.edge_padding + (sh + self.gap if cy >= mid else 0)
-                    w = sw
-                    h = sh
             
-            elif layout == "side_by_side":
-                cw = (mon_w - 2*self.edge_padding - self.gap) // 2
-                x = mon_x + self.edge_padding + (0 if cx < mon_x + mon_w//2 else cw + self.gap)
-                y = mon_y + self.edge_padding
-                w = cw
-                h = mon_h - 2*self.edge_padding
+            wins_on_mon = [
+                h for h in self.window_mgr.grid_state.hwnds_on(target_mon_idx)
+                if h != source_hwnd and self.window_mgr.is_alive(h)
+            ]
             
-            elif layout == "full":
-                x = mon_x + self.edge_padding
-                y = mon_y + self.edge_padding
-                w = mon_w - 2*self.edge_padding
-                h = mon_h - 2*self.edge_padding
+            # Also copy maxc and maxr (maintained by GridState)
+            maxc, maxr = self.window_mgr.grid_state.extents(target_mon_idx)
+        
+        count = len(wins_on_mon) + 1
+        layout, info = self.layout_engine.choose_layout(count)
+        
+        if layout == "grid":
+            cols, rows = info if info else (2, 2)
+            # Use previously copied values
+            hit_info = (max(cols, maxc + 1), max(rows, maxr + 1))
+        else:
+            hit_info = info
+        
+        # Calculate which cell cursor is in (specialized per geometry, cached)
+        col, row, x, y, w, h = self._get_hittest(monitor_rect, layout, hit_info)(cx, cy)
+        
+        return target_mon_idx, col, row, layout, info, (x, y, w, h)
+    
+    def calculate_target_rect(self, source_hwnd, cursor_pos):
+        """Calculate target snap rectangle for drag & drop."""
+        try:
+            resolved = self._resolve_drop(source_hwnd, cursor_pos)
+            # Remember what the preview showed so the drop can reuse it
+            self._last_resolve = (source_hwnd, resolved) if resolved else None
+            if not resolved:
+                return None
             
-            else:  # grid
-                cols, rows = info if info else (2, 2)
-                # Use previously copied values
-                cols = max(cols, maxc + 1)
-                rows = max(rows, maxr + 1)
-                
-                cw = (mon_w - 2*self.edge_padding - self.gap*(cols-1)) // cols
-                ch = (mon_h - 2*self.edge_padding - self.gap*(rows-1)) // rows
-                
-                relx = cx - mon_x - self.edge_padding
-                rely = cy - mon_y - self.edge_padding
-                col = min(max(0, relx // (cw + self.gap)), cols-1)
-                row = min(max(0, rely // (ch + self.gap)), rows-1)
-                
-                x = mon_x + self.edge_padding + col * (cw + self.gap)
-                y = mon_y + self.edge_padding + row * (ch + self.gap)
-                w = cw
-                h = ch
+            x, y, w, h = resolved[5]
             
-            # Frame border compensation
-            lb, tb, rb, bb = get_frame_borders(source_hwnd)
+            # Frame border compensation (reused across drag updates while the size holds)
+            rect = wintypes.RECT()
+            if user32.GetWindowRect(source_hwnd, ctypes.byref(rect)):
+                lb, tb, rb, bb = self.window_mgr.frame_borders(source_hwnd, rect)
+            else:
+                lb, tb, rb, bb = get_frame_borders(source_hwnd)
             return (int(x - lb), int(y - tb), int(w + lb + rb), int(h + tb + bb))
         
         except Exception as e:
@@ -3277,72 +4463,23 @@ class SmartGrid:
             old_pos = self.window_mgr.grid_state[source_hwnd]
         
         try:
-            cx, cy = cursor_pos
-            
-            # Find target monitor
-            target_mon_idx = 0
-            for i, (mx, my, mw, mh) in enumerate(self.monitors_cache):
-                if mx <= cx < mx + mw and my <= cy < my + mh:
-                    target_mon_idx = i
-                    break
-            
-            monitor_rect = self.monitors_cache[target_mon_idx]
-            mon_x, mon_y, mon_w, mon_h = monitor_rect
-            
-            # Atomic copy
-            with self.lock:
-                wins_on_mon = [
-                    h for h, (m, _, _) in self.window_mgr.grid_state.items()
-                    if m == target_mon_idx and user32.IsWindow(h) and h != source_hwnd
-                ]
-                
-                max_c = max((c for h,(m,c,r) in self.window_mgr.grid_state.items() 
-                            if m == target_mon_idx), default=0)
-                max_r = max((r for h,(m,c,r) in self.window_mgr.grid_state.items() 
-                            if m == target_mon_idx), default=0)
-            
-            count = len(wins_on_mon) + 1
-            layout, info = self.layout_engine.choose_layout(count)
-            
-            # Calculate target cell
-            target_col = target_row = 0
-            
-            if layout == "master_stack":
-                master_width = (mon_w - 2*self.edge_padding - self.gap) * 3 // 5
-                master_right = mon_x + self.edge_padding + master_width + self.gap//2
-                
-                if cx < master_right:
-                    target_col, target_row = 0, 0
-                else:
-                    mid_y = mon_y + mon_h // 2
-                    target_col = 1
-                    target_row = 0 if cy < mid_y else 1
-            
-            elif layout == "side_by_side":
-                target_col = 0 if cx < mon_x + mon_w // 2 else 1
-                target_row = 0
-            
-            elif layout == "full":
-                target_col, target_row = 0, 0
+            # Reuse the target the preview last displayed for this drag
+            last = self._last_resolve
+            self._last_resolve = None
+            if last and last[0] == source_hwnd:
+                resolved = last[1]
+            else:
+                resolved = self._resolve_drop(source_hwnd, cursor_pos)
+            if not resolved:
+                return
             
-            else:  # grid
-                cols, rows = info if info else (2, 2)
-                # Use copied values
-                cols = max(cols, max_c + 1)
-                rows = max(rows, max_r + 1)
-                
-                cell_w = (mon_w - 2*self.edge_padding - self.gap*(cols-1)) // cols
-                cell_h = (mon_h - 2*self.edge_padding - self.gap*(rows-1)) // rows
-                
-                rel_x = cx - mon_x - self.edge_padding
-                rel_y = cy - mon_y - self.edge_padding
-                target_col = min(max(0, rel_x // (cell_w + self.gap)), cols - 1)
-                target_row = min(max(0, rel_y // (cell_h + self.gap)), rows - 1)
+            target_mon_idx, target_col, target_row = resolved[:3]
             
             new_pos = (target_mon_idx, target_col, target_row)
             
             if old_pos == new_pos:
-                self.apply_grid_state()
+                # Magnetic return: only the dragged window left its cell
+                self.apply_grid_state(only_hwnd=source_hwnd)
                 return
 
             # Cross-monitor drop should "add + rebuild" on target monitor, not swap.
@@ -3367,14 +4504,15 @@ class SmartGrid:
             # Check if target cell is occupied (atomic)
             target_hwnd = None
             with self.lock:
-                for h, pos in self.window_mgr.grid_state.items():
-                    if pos == new_pos and h != source_hwnd and user32.IsWindow(h):
+                for h in self.window_mgr.grid_state.hwnds_at(new_pos):
+                    if h != source_hwnd and self.window_mgr.is_alive(h):
                         target_hwnd = h
                         break
                 
                 # Atomic modification
                 if target_hwnd:
-                    log(f"[SNAP] SWAP with '{win32gui.GetWindowText(target_hwnd)[:40]}'")
+                    if DEBUG:
+                        log(f"[SNAP] SWAP with '{self.window_mgr.window_title(target_hwnd, 40)}'")
                     # source_hwnd goes to target monitor/slot
                     self.window_mgr.grid_state[source_hwnd] = new_pos
 
@@ -3389,6 +4527,110 @@ class SmartGrid:
         except Exception as e:
             log(f"[ERROR] handle_snap_drop: {e}")
     
+    def _raw_mouse_input_loop(self):
+        """Background thread: track left button transitions via Raw Input."""
+        class RAWINPUTDEVICE(ctypes.Structure):
+            _fields_ = [
+                ("usUsagePage", wintypes.USHORT), ("usUsage", wintypes.USHORT),
+                ("dwFlags", wintypes.DWORD), ("hwndTarget", wintypes.HWND)
+            ]
+        
+        class RAWINPUTHEADER(ctypes.Structure):
+            _fields_ = [
+                ("dwType", wintypes.DWORD), ("dwSize", wintypes.DWORD),
+                ("hDevice", wintypes.HANDLE), ("wParam", wintypes.WPARAM)
+            ]
+        
+        class _RAWMOUSEBUTTONS(ctypes.Structure):
+            _fields_ = [("usButtonFlags", wintypes.USHORT), ("usButtonData", wintypes.USHORT)]
+        
+        class _RAWMOUSEUNION(ctypes.Union):
+            _fields_ = [("ulButtons", wintypes.ULONG), ("buttons", _RAWMOUSEBUTTONS)]
+        
+        class RAWMOUSE(ctypes.Structure):
+            _fields_ = [
+                ("usFlags", wintypes.USHORT), ("u", _RAWMOUSEUNION),
+                ("ulRawButtons", wintypes.ULONG), ("lLastX", wintypes.LONG),
+                ("lLastY", wintypes.LONG), ("ulExtraInformation", wintypes.ULONG)
+            ]
+        
+        class RAWINPUT(ctypes.Structure):
+            _fields_ = [("header", RAWINPUTHEADER), ("mouse", RAWMOUSE)]
+        
+        GetRawInputData = user32.GetRawInputData
+        GetRawInputData.argtypes = [
+            wintypes.HANDLE, wintypes.UINT, ctypes.c_void_p,
+            ctypes.POINTER(wintypes.UINT), wintypes.UINT
+        ]
+        GetRawInputData.restype = wintypes.UINT
+        
+        msg_hwnd = None
+        rid = RAWINPUTDEVICE()
+        try:
+            # Message-only sink window: WM_INPUT arrives even when we are in the background
+            msg_hwnd = user32.CreateWindowExW(
+                0, "STATIC", None, 0, 0, 0, 0, 0,
+                wintypes.HWND(HWND_MESSAGE), None, None, None
+            )
+            if not msg_hwnd:
+                log("[DRAG] Raw input window creation failed, falling back to polling")
+                return
+            
+            rid.usUsagePage = 0x01  # Generic desktop
+            rid.usUsage = 0x02      # Mouse
+            rid.dwFlags = RIDEV_INPUTSINK
+            rid.hwndTarget = msg_hwnd
+            if not user32.RegisterRawInputDevices(ctypes.byref(rid), 1, ctypes.sizeof(rid)):
+                log("[DRAG] RegisterRawInputDevices failed, falling back to polling")
+                return
+            
+            self._raw_input_thread_id = win32api.GetCurrentThreadId()
+            self._raw_input_ready = True
+            log("[DRAG] Raw input mouse stream active")
+            
+            raw = RAWINPUT()
+            header_size = ctypes.sizeof(RAWINPUTHEADER)
+            msg = wintypes.MSG()
+            while not self._stop_event.is_set():
+                ret = user32.GetMessageW(ctypes.byref(msg), None, 0, 0)
+                if ret == 0 or ret == -1:
+                    break
+                
+                if msg.message == WM_INPUT:
+                    size = wintypes.UINT(ctypes.sizeof(raw))
+                    got = GetRawInputData(
+                        msg.lParam, RID_INPUT, ctypes.byref(raw), ctypes.byref(size), header_size
+                    )
+                    if got not in (0, 0xFFFFFFFF) and raw.header.dwType == RIM_TYPEMOUSE:
+                        flags = raw.mouse.u.buttons.usButtonFlags
+                        if flags & RI_MOUSE_LEFT_BUTTON_DOWN:
+                            self._raw_lbutton_down = True
+                            self._mouse_event.set()
+                        if flags & RI_MOUSE_LEFT_BUTTON_UP:
+                            self._raw_lbutton_down = False
+                            self._mouse_event.set()
+                        elif self._raw_lbutton_down and (raw.mouse.lLastX or raw.mouse.lLastY):
+                            # Held button: movement drives the drag loop's next frame
+                            self._mouse_event.set()
+                
+                user32.DispatchMessageW(ctypes.byref(msg))
+        
+        except Exception as e:
+            log(f"[ERROR] raw_mouse_input_loop: {e}")
+        
+        finally:
+            self._raw_input_ready = False
+            self._raw_input_thread_id = None
+            self._mouse_event.set()
+            if msg_hwnd:
+                try:
+                    rid.dwFlags = RIDEV_REMOVE
+                    rid.hwndTarget = None
+                    user32.RegisterRawInputDevices(ctypes.byref(rid), 1, ctypes.sizeof(rid))
+                except Exception:
+                    pass
+                user32.DestroyWindow(msg_hwnd)
+    
     def start_drag_snap_monitor(self):
         """Background thread: drag detection with live preview."""
         was_down = False
@@ -3398,14 +4640,31 @@ class SmartGrid:
         drag_start = None
         preview_active = False
         last_valid_rect = None
+        last_cursor_pos = None
+        next_frame = 0.0
 
         WM_NCHITTEST = 0x0084
         HTCLIENT = 1
         HTCAPTION = 2
         
+        # The preview overlay is owned (and only touched) by this thread: create it
+        # up front so the first drag frame does not pay for class/window creation
+        self.create_overlay_window()
+        msg = wintypes.MSG()
+        
         while not self._stop_event.is_set():
             try:
-                down = win32api.GetAsyncKeyState(win32con.VK_LBUTTON) & 0x8000
+                # Service the overlay's queue (sent/broadcast messages included)
+                while user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_REMOVE):
+                    user32.DispatchMessageW(ctypes.byref(msg))
+                
+                if self._raw_input_ready:
+                    down = self._raw_lbutton_down
+                    # Recover from a missed WM_INPUT release (e.g. secure desktop switch)
+                    if down and not (win32api.GetAsyncKeyState(win32con.VK_LBUTTON) & 0x8000):
+                        self._raw_lbutton_down = down = False
+                else:
+                    down = win32api.GetAsyncKeyState(win32con.VK_LBUTTON) & 0x8000
                 
                 # Mouse down
                 if down and not was_down:
@@ -3417,7 +4676,6 @@ class SmartGrid:
                     
                     # Climb to top-level
                     try:
-                        GA_ROOT = 2
                         top = ctypes.windll.user32.GetAncestor(hwnd, GA_ROOT)
                         if top:
                             hwnd = top
@@ -3435,7 +4693,7 @@ class SmartGrid:
                         hwnd = user32.GetForegroundWindow()
                     
                     # Check maximized
-                    if hwnd and get_window_state(hwnd) == 'maximized':
+                    if hwnd and self.window_mgr.is_window_maximized(hwnd):
                         was_down = True
                         continue
                     
@@ -3495,6 +4753,7 @@ class SmartGrid:
                         candidate_hwnd = None
                         candidate_start = None
                         preview_active = True
+                        self._last_resolve = None
                         self.drag_drop_lock = True
                 
                 # Drag in progress
@@ -3505,7 +4764,9 @@ class SmartGrid:
                         dx = abs(cursor_pos[0] - drag_start[0])
                         dy = abs(cursor_pos[1] - drag_start[1])
                         
-                        if preview_active:
+                        # Coalesced: a frame whose cursor did not move keeps the current preview
+                        if preview_active and cursor_pos != last_cursor_pos:
+                            last_cursor_pos = cursor_pos
                             target_rect = self.calculate_target_rect(drag_hwnd, cursor_pos)
                             if target_rect:
                                 last_valid_rect = target_rect
@@ -3531,11 +4792,26 @@ class SmartGrid:
                         drag_start = None
                         preview_active = False
                         last_valid_rect = None
+                        last_cursor_pos = None
                     candidate_hwnd = None
                     candidate_start = None
                 
                 was_down = down
-                time.sleep(1.0 / DRAG_MONITOR_FPS)  # ~60 FPS
+                if self._raw_input_ready and down:
+                    # Button held: next frame on a Raw Input move/release, paced to
+                    # DRAG_MONITOR_FPS (a still cursor needs no preview update)
+                    remaining = next_frame - time.perf_counter()
+                    if remaining > 0:
+                        precise_sleep(remaining)
+                    self._mouse_event.wait(0.25)
+                    self._mouse_event.clear()
+                    next_frame = time.perf_counter() + 1.0 / DRAG_MONITOR_FPS
+                elif self._raw_input_ready and not drag_hwnd and not candidate_hwnd:
+                    # Idle: sleep until Raw Input reports a button transition
+                    self._mouse_event.wait(0.5)
+                    self._mouse_event.clear()
+                else:
+                    time.sleep(1.0 / DRAG_MONITOR_FPS)  # ~60 FPS
             
             except Exception as e:
                 log(f"[ERROR] drag_snap_monitor: {e}")
@@ -3544,6 +4820,7 @@ class SmartGrid:
                 drag_hwnd = None
                 drag_start = None
                 preview_active = False
+                last_cursor_pos = None
                 candidate_hwnd = None
                 candidate_start = None
                 time.sleep(0.1)
@@ -3574,22 +4851,23 @@ class SmartGrid:
                 if other_ws_idx == ws or not isinstance(other_map, dict):
                     continue
                 other_ws_hwnds.update(other_map.keys())
-            grid_snapshot = dict(self.window_mgr.grid_state)
+            grid_on_monitor = list(self.window_mgr.grid_state.iter_mon(monitor_idx))
             minimized_snapshot = dict(self.window_mgr.minimized_windows)
             maximized_snapshot = dict(self.window_mgr.maximized_windows)
+            # Runtime monitor is only consulted for the previous entries: look
+            # those up instead of copying the whole grid_state
+            runtime_monitor_by_hwnd = {}
+            for hwnd in previous_ws_map:
+                pos = (self.window_mgr.grid_state.get(hwnd) or
+                       minimized_snapshot.get(hwnd) or maximized_snapshot.get(hwnd))
+                if pos:
+                    runtime_monitor_by_hwnd[hwnd] = pos[0]
             state_ws_snapshot = dict(self.window_state_ws)
             hidden_bucket_snapshot = set(
                 self._workspace_hidden_windows.get((monitor_idx, ws), set())
             )
 
         saved_ws_map = {}
-        runtime_monitor_by_hwnd = {}
-        for hwnd, (mon, _c, _r) in grid_snapshot.items():
-            runtime_monitor_by_hwnd[hwnd] = mon
-        for hwnd, (mon, _c, _r) in minimized_snapshot.items():
-            runtime_monitor_by_hwnd.setdefault(hwnd, mon)
-        for hwnd, (mon, _c, _r) in maximized_snapshot.items():
-            runtime_monitor_by_hwnd.setdefault(hwnd, mon)
 
         def _entry_with_identity(hwnd, pos, grid, state):
             entry = {
@@ -3613,60 +4891,56 @@ class SmartGrid:
                 entry['title'] = title
             return entry
 
-        # Save normal windows
-        for hwnd, (mon, col, row) in grid_snapshot.items():
-            if mon != monitor_idx or not user32.IsWindow(hwnd):
+        # Save normal, minimized and maximized windows in one pass. Normal windows
+        # always count as runtime-active (grid_state ownership is trusted);
+        # min/max windows need a workspace ownership check first.
+        runtime_active_hwnds = set()
+        tracked_items = itertools.chain(
+            ((hwnd, 'normal', monitor_idx, col, row) for hwnd, col, row in grid_on_monitor),
+            ((hwnd, 'minimized', *pos) for hwnd, pos in minimized_snapshot.items()),
+            ((hwnd, 'maximized', *pos) for hwnd, pos in maximized_snapshot.items()),
+        )
+        # Loop-invariant lookups bound once (one scratch RECT for every window)
+        is_window = user32.IsWindow
+        get_rect = user32.GetWindowRect
+        frame_borders = self.window_mgr.frame_borders
+        rect, rect_ref = scratch_rect()
+        for hwnd, state, mon, col, row in tracked_items:
+            if mon != monitor_idx or not is_window(hwnd):
                 continue
 
-            try:
-                rect = wintypes.RECT()
-                if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
-                    continue
+            if state == 'normal':
+                runtime_active_hwnds.add(hwnd)
+                try:
+                    if not get_rect(hwnd, rect_ref):
+                        continue
 
-                lb, tb, rb, bb = get_frame_borders(hwnd)
-                x = rect.left + lb
-                y = rect.top + tb
-                w = rect.right - rect.left - lb - rb
-                h = rect.bottom - rect.top - tb - bb
+                    lb, tb, rb, bb = frame_borders(hwnd, rect)
+                    x = rect.left + lb
+                    y = rect.top + tb
+                    w = rect.right - rect.left - lb - rb
+                    h = rect.bottom - rect.top - tb - bb
 
-                saved_ws_map[hwnd] = _entry_with_identity(
-                    hwnd, (x, y, w, h), (col, row), 'normal'
-                )
-            except Exception as e:
-                log(f"[ERROR] save_workspace (normal): {e}")
-        
-        # Save minimized windows
-        for hwnd, (mon, col, row) in minimized_snapshot.items():
-            if mon != monitor_idx or not user32.IsWindow(hwnd):
-                continue
-            origin_ws = state_ws_snapshot.get(hwnd)
-            if origin_ws is not None and origin_ws != ws:
-                continue
-            if origin_ws is None:
-                owner_ws = self._find_workspace_owner(monitor_idx, hwnd, prefer_ws=ws)
-                if owner_ws is not None and owner_ws != ws:
-                    continue
-            if hwnd in saved_ws_map:
+                    saved_ws_map[hwnd] = _entry_with_identity(
+                        hwnd, (x, y, w, h), (col, row), 'normal'
+                    )
+                except Exception as e:
+                    log(f"[ERROR] save_workspace (normal): {e}")
                 continue
-            saved_ws_map[hwnd] = _entry_with_identity(
-                hwnd, (0, 0, 800, 600), (col, row), 'minimized'
-            )
 
-        # Save maximized windows
-        for hwnd, (mon, col, row) in maximized_snapshot.items():
-            if mon != monitor_idx or not user32.IsWindow(hwnd):
-                continue
             origin_ws = state_ws_snapshot.get(hwnd)
-            if origin_ws is not None and origin_ws != ws:
+            if origin_ws is not None and int(origin_ws) != int(ws):
                 continue
             if origin_ws is None:
                 owner_ws = self._find_workspace_owner(monitor_idx, hwnd, prefer_ws=ws)
-                if owner_ws is not None and owner_ws != ws:
+                if owner_ws is not None and int(owner_ws) != int(ws):
                     continue
+            if state == 'maximized':
+                runtime_active_hwnds.add(hwnd)
             if hwnd in saved_ws_map:
                 continue
             saved_ws_map[hwnd] = _entry_with_identity(
-                hwnd, (0, 0, 800, 600), (col, row), 'maximized'
+                hwnd, _DUMMY_POS, (col, row), state
             )
 
         # Fallback: keep previous live entries missing from runtime snapshots.
@@ -3701,14 +4975,7 @@ class SmartGrid:
             except Exception:
                 continue
 
-            pos = data.get('pos', (0, 0, 800, 600))
-            if not isinstance(pos, (list, tuple)) or len(pos) != 4:
-                pos = (0, 0, 800, 600)
-            else:
-                try:
-                    pos = (int(pos[0]), int(pos[1]), int(pos[2]), int(pos[3]))
-                except Exception:
-                    pos = (0, 0, 800, 600)
+            pos = normalize_saved_pos(data.get('pos'))
 
             state = str(data.get('state', 'normal')).lower()
             if state not in ('normal', 'minimized', 'maximized'):
@@ -3736,14 +5003,7 @@ class SmartGrid:
                 row = int(grid[1])
             except Exception:
                 continue
-            pos = data.get('pos', (0, 0, 800, 600))
-            if not isinstance(pos, (list, tuple)) or len(pos) != 4:
-                pos = (0, 0, 800, 600)
-            else:
-                try:
-                    pos = (int(pos[0]), int(pos[1]), int(pos[2]), int(pos[3]))
-                except Exception:
-                    pos = (0, 0, 800, 600)
+            pos = normalize_saved_pos(data.get('pos'))
             state = str(data.get('state', 'normal')).lower()
             if state not in ('normal', 'minimized', 'maximized'):
                 state = 'normal'
@@ -3752,26 +5012,6 @@ class SmartGrid:
             )
             preserved_count += 1
 
-        runtime_active_hwnds = set()
-        # For normal tiled windows, trust runtime grid_state ownership on this monitor.
-        # window_state_ws can be stale just after transitions and must not down-count.
-        for hwnd, (mon, _col, _row) in grid_snapshot.items():
-            if mon != monitor_idx or not user32.IsWindow(hwnd):
-                continue
-            runtime_active_hwnds.add(hwnd)
-        # For maximized windows, keep workspace checks because they are stored out of grid_state.
-        for hwnd, (mon, _col, _row) in maximized_snapshot.items():
-            if mon != monitor_idx or not user32.IsWindow(hwnd):
-                continue
-            origin_ws = state_ws_snapshot.get(hwnd)
-            if origin_ws is not None and int(origin_ws) != int(ws):
-                continue
-            if origin_ws is None:
-                owner_ws = self._find_workspace_owner(monitor_idx, hwnd, prefer_ws=ws)
-                if owner_ws is not None and int(owner_ws) != int(ws):
-                    continue
-            runtime_active_hwnds.add(hwnd)
-
         runtime_active_count = len(runtime_active_hwnds)
 
         runtime_inferred_sig = None
@@ -3806,8 +5046,8 @@ class SmartGrid:
                 return {}
 
             runtime_slot_hwnd = {}
-            for hwnd, (m_idx, col, row) in grid_snapshot.items():
-                if int(m_idx) != int(monitor_idx) or not user32.IsWindow(hwnd):
+            for hwnd, col, row in grid_on_monitor:
+                if not user32.IsWindow(hwnd):
                     continue
                 slot = (int(col), int(row))
                 if slot in valid_slots:
@@ -3825,14 +5065,7 @@ class SmartGrid:
                     return None
                 if slot not in valid_slots:
                     return None
-                pos = entry.get("pos", (0, 0, 800, 600))
-                if not isinstance(pos, (list, tuple)) or len(pos) != 4:
-                    pos = (0, 0, 800, 600)
-                else:
-                    try:
-                        pos = (int(pos[0]), int(pos[1]), int(pos[2]), int(pos[3]))
-                    except Exception:
-                        pos = (0, 0, 800, 600)
+                pos = normalize_saved_pos(entry.get("pos"))
                 state = str(entry.get("state", "normal")).lower()
                 if state not in ("normal", "minimized", "maximized"):
                     state = "normal"
@@ -4017,14 +5250,7 @@ class SmartGrid:
                     row = int(grid[1])
                 except Exception:
                     continue
-                pos = data.get('pos', (0, 0, 800, 600))
-                if not isinstance(pos, (list, tuple)) or len(pos) != 4:
-                    pos = (0, 0, 800, 600)
-                else:
-                    try:
-                        pos = (int(pos[0]), int(pos[1]), int(pos[2]), int(pos[3]))
-                    except Exception:
-                        pos = (0, 0, 800, 600)
+                pos = normalize_saved_pos(data.get('pos'))
                 state = str(data.get('state', 'normal')).lower()
                 if state not in ('normal', 'minimized', 'maximized'):
                     state = 'normal'
@@ -4143,7 +5369,7 @@ class SmartGrid:
             if slot is None:
                 slot = (0, 0)
             layout[hwnd] = {
-                'pos': (0, 0, 800, 600),
+                'pos': _DUMMY_POS,
                 'grid': (int(slot[0]), int(slot[1])),
                 'state': 'normal',
             }
@@ -4168,9 +5394,14 @@ class SmartGrid:
         grid_updates = {}
         minimized_updates = {}
         maximized_updates = {}
+        restoring = []
         
+        # Pass 1: fire every show/restore without waiting on each window
+        self._restore_event.clear()
+        is_window = user32.IsWindow
+        show_async = user32.ShowWindowAsync
         for hwnd, data in layout.items():
-            if not user32.IsWindow(hwnd):
+            if not is_window(hwnd):
                 continue
             
             try:
@@ -4178,43 +5409,58 @@ class SmartGrid:
                 saved_state = data.get('state', 'normal')
                 
                 if saved_state == 'minimized':
-                    user32.ShowWindowAsync(hwnd, win32con.SW_MINIMIZE)
+                    show_async(hwnd, win32con.SW_MINIMIZE)
                     minimized_updates[hwnd] = (monitor_idx, col, row)
                 elif saved_state == 'maximized':
-                    user32.ShowWindowAsync(hwnd, win32con.SW_MAXIMIZE)
+                    show_async(hwnd, win32con.SW_MAXIMIZE)
                     maximized_updates[hwnd] = (monitor_idx, col, row)
                 else:
                     if win32gui.IsIconic(hwnd):
-                        user32.ShowWindowAsync(hwnd, SW_RESTORE)
-                        time.sleep(0.08)
-                    if not user32.IsWindowVisible(hwnd):
-                        user32.ShowWindowAsync(hwnd, SW_SHOWNORMAL)
-                        time.sleep(0.08)
+                        show_async(hwnd, SW_RESTORE)
+                        restoring.append(hwnd)
+                    elif not user32.IsWindowVisible(hwnd):
+                        show_async(hwnd, SW_SHOWNORMAL)
                     grid_updates[hwnd] = (monitor_idx, col, row)
-                
-                time.sleep(0.015)
             
             except Exception as e:
                 log(f"[ERROR] load_workspace: {e}")
         
+        # Pass 2: one bounded wait for the whole restore batch (woken by the
+        # hook's MINIMIZEEND instead of fixed polling ticks while hooks run)
+        deadline = time.time() + 0.08
+        while restoring and time.time() < deadline:
+            if self.window_mgr.event_tracking:
+                self._restore_event.wait(max(0.0, deadline - time.time()))
+                self._restore_event.clear()
+            else:
+                time.sleep(0.01)
+            restoring = [h for h in restoring if user32.IsWindow(h) and win32gui.IsIconic(h)]
+        for hwnd in restoring:
+            if not user32.IsWindowVisible(hwnd):
+                user32.ShowWindowAsync(hwnd, SW_SHOWNORMAL)
+        
         with self.lock:
+            grid = self.window_mgr.grid_state
+            minimized = self.window_mgr.minimized_windows
+            maximized = self.window_mgr.maximized_windows
+            state_ws = self.window_state_ws
             for hwnd, pos in minimized_updates.items():
-                self.window_mgr.minimized_windows[hwnd] = pos
-                self.window_state_ws[hwnd] = ws_idx
-                self.window_mgr.grid_state.pop(hwnd, None)
-                self.window_mgr.maximized_windows.pop(hwnd, None)
+                minimized[hwnd] = pos
+                state_ws[hwnd] = ws_idx
+                grid.pop(hwnd, None)
+                maximized.pop(hwnd, None)
             
             for hwnd, pos in maximized_updates.items():
-                self.window_mgr.maximized_windows[hwnd] = pos
-                self.window_state_ws[hwnd] = ws_idx
-                self.window_mgr.grid_state.pop(hwnd, None)
-                self.window_mgr.minimized_windows.pop(hwnd, None)
+                maximized[hwnd] = pos
+                state_ws[hwnd] = ws_idx
+                grid.pop(hwnd, None)
+                minimized.pop(hwnd, None)
             
             for hwnd, pos in grid_updates.items():
-                self.window_mgr.grid_state[hwnd] = pos
-                self.window_state_ws.pop(hwnd, None)
-                self.window_mgr.minimized_windows.pop(hwnd, None)
-                self.window_mgr.maximized_windows.pop(hwnd, None)
+                grid[hwnd] = pos
+                state_ws.pop(hwnd, None)
+                minimized.pop(hwnd, None)
+                maximized.pop(hwnd, None)
 
             hidden_bucket = self._workspace_hidden_windows.get((monitor_idx, ws_idx))
             if hidden_bucket:
@@ -4224,13 +5470,11 @@ class SmartGrid:
                 if not hidden_bucket:
                     self._workspace_hidden_windows.pop((monitor_idx, ws_idx), None)
         
-        time.sleep(0.15)
-        # Force one immediate retile for the target workspace now that grid_state is ready.
-        self.ignore_retile_until = 0.0
-        self.smart_tile_with_restore()
-        log(f"[WS] ✓ Workspace {ws_idx+1} restored")
-        # Keep a small debounce window only.
+        # One trailing retile once the restore burst settles (rapid switches coalesce);
+        # hold auto-retiles off until it runs.
         self.ignore_retile_until = time.time() + 0.35
+        self.request_retile(0.12)
+        log(f"[WS] ✓ Workspace {ws_idx+1} restored")
     
     def ws_switch(self, ws_idx, monitor_idx=None):
         """Switch to specified workspace on the requested monitor."""
@@ -4238,7 +5482,11 @@ class SmartGrid:
             log("[WS] Switch ignored (already in progress)")
             return
         self.workspace_switching_lock = True
-        time.sleep(0.25)
+        # Supersede retiles still pending from a previous switch
+        self.retile_generation += 1
+        # Barrier: let an in-flight tiling pass finish instead of sleeping
+        with self._tiling_lock:
+            pass
         was_active = self.is_active
         
         try:
@@ -4266,9 +5514,11 @@ class SmartGrid:
             # Ensure reopened windows are represented in grid_state before save.
             if was_active:
                 try:
-                    with self.lock:
-                        self.ignore_retile_until = 0.0
-                    self.smart_tile_with_restore()
+                    # Blocking: the save below must see this pass, not a queued one
+                    with self._tiling_lock:
+                        with self.lock:
+                            self.ignore_retile_until = 0.0
+                        self.smart_tile_with_restore(blocking=True)
                     self._sync_window_state_changes()
                 except Exception:
                     pass
@@ -4283,6 +5533,10 @@ class SmartGrid:
                 source_ws = self.current_workspace.get(mon, 0)
                 source_map = dict(self.workspaces.get(mon, [{}, {}, {}])[source_ws])
                 hidden_bucket = self._workspace_hidden_windows.setdefault((mon, source_ws), set())
+                grid = self.window_mgr.grid_state
+                minimized = self.window_mgr.minimized_windows
+                maximized = self.window_mgr.maximized_windows
+                state_ws = self.window_state_ws
                 for hwnd in list(source_map.keys()):
                     if user32.IsWindow(hwnd):
                         # Use minimize instead of hide to avoid some apps destroying their
@@ -4301,10 +5555,10 @@ class SmartGrid:
                             except Exception:
                                 pass
                         hidden_bucket.add(hwnd)
-                    self.window_mgr.grid_state.pop(hwnd, None)
-                    self.window_mgr.minimized_windows.pop(hwnd, None)
-                    self.window_mgr.maximized_windows.pop(hwnd, None)
-                    self.window_state_ws.pop(hwnd, None)
+                    grid.pop(hwnd, None)
+                    minimized.pop(hwnd, None)
+                    maximized.pop(hwnd, None)
+                    state_ws.pop(hwnd, None)
             
             log(f"[WS] Parked {parked} windows from workspace {self.current_workspace.get(mon, 0)+1}")
             
@@ -4315,7 +5569,6 @@ class SmartGrid:
             self.layout_capacity.pop(mon, None)
             
             # Load new
-            time.sleep(0.1)
             self.load_workspace(mon, ws_idx)
             
             # Update count
@@ -4328,8 +5581,6 @@ class SmartGrid:
                                          len(self.window_mgr.minimized_windows) +
                                          len(self.window_mgr.maximized_windows))
             
-            time.sleep(0.2)
-            
             log(f"[WS] ✓ Switched to workspace {ws_idx+1}")
         
         except Exception as e:
@@ -4444,11 +5695,7 @@ class SmartGrid:
             import tkinter as tk
             from tkinter import ttk
             
-            root = tk.Tk()
-            root.withdraw()
-            root.attributes('-topmost', True)
-            
-            dialog = tk.Toplevel(root)
+            dialog = tk.Tk()
             dialog.title("SmartGrid Settings")
             dialog.attributes('-topmost', True)
             dialog.resizable(True, True)
@@ -4726,12 +5973,9 @@ class SmartGrid:
                 anim_fps_n = fps_values[int(fps_idx_var.get())]
                 anim_effect_key = effect_map.get(effect_var.get(), "crit_damped")
                 
-                # Close BEFORE modifying
+                # Close BEFORE modifying (destroy() tears the Win32 window down
+                # synchronously, so no settle wait is needed)
                 dialog.destroy()
-                root.destroy()
-                
-                # Wait for Tkinter to fully close
-                time.sleep(0.3)
                 
                 # Now modify
                 self.gap = int(gap_str)
@@ -4765,7 +6009,6 @@ class SmartGrid:
             
             def cancel_and_close():
                 dialog.destroy()
-                root.destroy()
             
             def reset_defaults():
                 gap_var.set(gap_options[3])
@@ -4813,11 +6056,10 @@ class SmartGrid:
             def on_close():
                 self.ignore_retile_until = old_ignore
                 dialog.destroy()
-                root.destroy()
             
             dialog.protocol("WM_DELETE_WINDOW", on_close)
             
-            root.mainloop()
+            dialog.wait_window(dialog)
             
         except Exception as e:
             log(f"[ERROR] show_settings_dialog: {e}")
@@ -4828,55 +6070,168 @@ class SmartGrid:
     
     def apply_new_settings(self):
         """Apply updated settings and force one clean retile."""
-        # Wait for all Tkinter windows to close
-        time.sleep(0.5)
-        
-        # Clean up dead windows
-        self.window_mgr.cleanup_dead_windows()
+        # Clean up dead and ghost windows
+        self.window_mgr.cleanup_windows()
         self._backfill_window_state_ws()
-        self.window_mgr.cleanup_ghost_windows()
         
         # Temporarily block drag & drop
         self.drag_drop_lock = True
         
         # Reset the counters
-        self.ignore_retile_until = 0
         self.last_visible_count = 0
+        # Gap/padding changed: drop hit-test tables built for the old geometry
+        self._grid_mappers.clear()
         
         log("[SETTINGS] Applying new settings...")
         
-        # Re-tile with the new settings
-        self.smart_tile_with_restore()
-        
-        time.sleep(0.2)
+        # Re-tile with the new settings: wait out any running pass and reset the
+        # grace window under the same lock, so the new gap/padding is on screen
+        # (the pass ends with its own settle wait) before drag & drop resumes
+        with self._tiling_lock:
+            self.ignore_retile_until = 0
+            self.smart_tile_with_restore(blocking=True)
         
         # Reactivate
         self.drag_drop_lock = False
         
         log("[SETTINGS] ✓ Settings applied successfully")
     
+    def save_state(self):
+        """Persist settings and per-workspace layout choices to STATE_FILE."""
+        with self._state_lock:
+            self._write_state()
+    
+    def _write_state(self):
+        """save_state body (caller holds _state_lock)."""
+        wm = self.window_mgr
+        with self.lock:
+            layout_signatures = dict(self.workspace_layout_signature)
+        state = {
+            'version': STATE_VERSION,
+            'settings': {
+                'gap': self.gap,
+                'edge_padding': self.edge_padding,
+                'retile_debounce': self.retile_debounce,
+                'tile_timeout': wm.tile_timeout,
+                'max_tile_retries': wm.max_tile_retries,
+                'animation_enabled': wm.animation_enabled,
+                'animation_duration': wm.animation_duration,
+                'animation_fps': wm.animation_fps,
+                'animation_effect': wm.animation_effect,
+                'compact_on_minimize': self.compact_on_minimize,
+                'compact_on_close': self.compact_on_close,
+            },
+            'workspace_layout_signature': layout_signatures,
+            'window_slots': self._snapshot_slots(),
+        }
+        tmp_path = STATE_FILE + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, STATE_FILE)
+            log(f"[STATE] Saved to {STATE_FILE}")
+        except Exception as e:
+            log(f"[ERROR] save_state: {e}")
+    
+    def load_state(self):
+        """Restore settings saved by save_state (call before start())."""
+        try:
+            with open(STATE_FILE, "rb") as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            log(f"[ERROR] load_state: {e}")
+            return
+        
+        if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+            log("[STATE] Ignoring state file (unknown version)")
+            return
+        
+        wm = self.window_mgr
+        settings = state.get('settings') or {}
+        try:
+            self.gap = wm.gap = int(settings.get('gap', self.gap))
+            self.edge_padding = wm.edge_padding = int(settings.get('edge_padding', self.edge_padding))
+            self.retile_debounce = float(settings.get('retile_debounce', self.retile_debounce))
+            wm.tile_timeout = float(settings.get('tile_timeout', wm.tile_timeout))
+            wm.max_tile_retries = int(settings.get('max_tile_retries', wm.max_tile_retries))
+            wm.animation_enabled = bool(settings.get('animation_enabled', wm.animation_enabled))
+            wm.animation_duration = float(settings.get('animation_duration', wm.animation_duration))
+            wm.animation_fps = int(settings.get('animation_fps', wm.animation_fps))
+            wm.animation_effect = str(settings.get('animation_effect', wm.animation_effect))
+            self.compact_on_minimize = bool(settings.get('compact_on_minimize', self.compact_on_minimize))
+            self.compact_on_close = bool(settings.get('compact_on_close', self.compact_on_close))
+        except Exception as e:
+            log(f"[ERROR] load_state (settings): {e}")
+        
+        layout_signatures = state.get('workspace_layout_signature') or {}
+        with self.lock:
+            for key, sig in layout_signatures.items():
+                try:
+                    (mon_idx, ws_idx), (layout, info) = key, sig
+                except Exception:
+                    continue
+                if mon_idx in self.workspaces and 0 <= ws_idx < len(self.workspaces[mon_idx]):
+                    self.workspace_layout_signature[(mon_idx, ws_idx)] = (
+                        self._normalize_layout_signature(layout, info)
+                    )
+        
+        window_slots = state.get('window_slots')
+        if isinstance(window_slots, dict):
+            self._saved_slots = window_slots
+            self._boot_slots = True  # Resolved against the live topology on first retile
+        log(f"[STATE] Loaded from {STATE_FILE}")
+    
+    def _topology_key(self):
+        """Monitor work-area layout the persisted slots belong to."""
+        return repr(tuple(tuple(m) for m in self.monitors_cache))
+    
+    def _window_identity(self, hwnd, win_class):
+        """Reboot-stable identity for a window (HWNDs don't survive restarts)."""
+        return (get_process_name(hwnd, self.window_mgr._pid_names()), win_class)
+    
+    def _snapshot_slots(self):
+        """Return _saved_slots with the current grid_state recorded for this topology."""
+        with self.lock:
+            grid_snapshot = dict(self.window_mgr.grid_state)
+        slots = {}
+        for hwnd, pos in sorted(grid_snapshot.items(), key=lambda item: item[1]):
+            if not user32.IsWindow(hwnd):
+                continue
+            ident = self._window_identity(hwnd, get_window_class(hwnd))
+            if ident[0]:
+                slots.setdefault(ident, []).append(pos)
+        if slots and self.monitors_cache:
+            self._saved_slots[self._topology_key()] = slots
+        return self._saved_slots
+    
+    def _take_boot_slot(self, hwnd, win_class):
+        """Pop the persisted (mon, col, row) for a window first seen after startup, or None."""
+        if self._boot_slots is True:
+            cached = self._saved_slots.get(self._topology_key()) or {}
+            self._boot_slots = {ident: list(slots) for ident, slots in cached.items()}
+        if not self._boot_slots:
+            return None
+        slots = self._boot_slots.get(self._window_identity(hwnd, win_class))
+        while slots:
+            mon_idx, col, row = slots.pop(0)
+            if mon_idx < len(self.monitors_cache):
+                return mon_idx, col, row
+        return None
+    
     # ==========================================================================
     # HOTKEYS & SYSTRAY
     # ==========================================================================
     
     def register_hotkeys(self):
         """Register global hotkeys."""
-        hotkeys = [
-            (HOTKEY_TOGGLE, win32con.MOD_CONTROL | win32con.MOD_ALT, ord('T')),
-            (HOTKEY_RETILE, win32con.MOD_CONTROL | win32con.MOD_ALT, ord('R')),
-            (HOTKEY_QUIT, win32con.MOD_CONTROL | win32con.MOD_ALT, ord('Q')),
-            (HOTKEY_SWAP_MODE, win32con.MOD_CONTROL | win32con.MOD_ALT, ord('S')),
-            (HOTKEY_WS1, win32con.MOD_CONTROL | win32con.MOD_ALT, ord('1')),
-            (HOTKEY_WS2, win32con.MOD_CONTROL | win32con.MOD_ALT, ord('2')),
-            (HOTKEY_WS3, win32con.MOD_CONTROL | win32con.MOD_ALT, ord('3')),
-            (HOTKEY_FLOAT_TOGGLE, win32con.MOD_CONTROL | win32con.MOD_ALT, ord('F')),
-            (HOTKEY_LAYOUT_PICKER, win32con.MOD_CONTROL | win32con.MOD_ALT, ord('P')),
-        ]
-        
+        register = user32.RegisterHotKey
         failed = []
-        for hk_id, mod, key in hotkeys:
+        for hk_id, mod, key in HOTKEY_TABLE:
             try:
-                if not user32.RegisterHotKey(None, hk_id, mod, key):
+                if not register(None, hk_id, mod, key):
                     failed.append(hk_id)
                     log(f"[WARN] Failed to register hotkey {hk_id}")
             except Exception as e:
@@ -4902,31 +6257,28 @@ class SmartGrid:
     
     def unregister_hotkeys(self):
         """Unregister all hotkeys."""
-        for hk in (HOTKEY_TOGGLE, HOTKEY_RETILE, HOTKEY_QUIT,
-                   HOTKEY_SWAP_MODE, HOTKEY_WS1, HOTKEY_WS2, HOTKEY_WS3,
-                   HOTKEY_FLOAT_TOGGLE, HOTKEY_LAYOUT_PICKER):
+        unregister = user32.UnregisterHotKey
+        for hk, _mod, _key in HOTKEY_TABLE:
             try:
-                user32.UnregisterHotKey(None, hk)
+                unregister(None, hk)
             except Exception:
                 pass
     
     def register_swap_hotkeys(self):
         """Register swap mode arrow keys."""
-        try:
-            user32.RegisterHotKey(None, HOTKEY_SWAP_LEFT, 0, win32con.VK_LEFT)
-            user32.RegisterHotKey(None, HOTKEY_SWAP_RIGHT, 0, win32con.VK_RIGHT)
-            user32.RegisterHotKey(None, HOTKEY_SWAP_UP, 0, win32con.VK_UP)
-            user32.RegisterHotKey(None, HOTKEY_SWAP_DOWN, 0, win32con.VK_DOWN)
-            user32.RegisterHotKey(None, HOTKEY_SWAP_CONFIRM, 0, win32con.VK_RETURN)
-        except Exception as e:
-            log(f"[ERROR] register_swap_hotkeys: {e}")
+        register = user32.RegisterHotKey
+        for hk_id, mod, key in SWAP_HOTKEY_TABLE:
+            try:
+                register(None, hk_id, mod, key)
+            except Exception as e:
+                log(f"[ERROR] register_swap_hotkeys: {e}")
     
     def unregister_swap_hotkeys(self):
         """Unregister swap mode hotkeys."""
-        for hk in (HOTKEY_SWAP_LEFT, HOTKEY_SWAP_RIGHT, HOTKEY_SWAP_UP, 
-                   HOTKEY_SWAP_DOWN, HOTKEY_SWAP_CONFIRM):
+        unregister = user32.UnregisterHotKey
+        for hk, _mod, _key in SWAP_HOTKEY_TABLE:
             try:
-                user32.UnregisterHotKey(None, hk)
+                unregister(None, hk)
             except Exception:
                 pass
     
@@ -4939,24 +6291,24 @@ class SmartGrid:
                 checked=lambda item: self.is_active
             ),
             MenuItem('Force Re-tile All Windows (Ctrl+Alt+R)',
-                     lambda: threading.Thread(target=self.force_immediate_retile, daemon=True).start()),
+                     lambda: ACTION_POOL.submit(self.force_immediate_retile)),
             MenuItem(
                 f"Swap Mode: {'ON' if self.swap_mode_lock else 'OFF'} (Ctrl+Alt+S)",
                 lambda: user32.PostThreadMessageW(self.main_thread_id, CUSTOM_TOGGLE_SWAP, 0, 0),
                 checked=lambda item: self.swap_mode_lock
             ),
             MenuItem('Toggle Floating Selected Window (Ctrl+Alt+F)',
-                     lambda: threading.Thread(target=self.toggle_floating_selected, daemon=True).start()),
+                     lambda: ACTION_POOL.submit(self.toggle_floating_selected)),
             MenuItem('Layout Manager (Ctrl+Alt+P)',
                      lambda: user32.PostThreadMessageW(self.main_thread_id, CUSTOM_OPEN_LAYOUT_PICKER, 0, 0)),
             Menu.SEPARATOR,
             MenuItem('Workspaces', Menu(
                 MenuItem('Switch to Workspace 1 (Ctrl+Alt+1)',
-                         lambda: threading.Thread(target=self.ws_switch, args=(0,), daemon=True).start()),
+                         lambda: ACTION_POOL.submit(self.ws_switch, 0)),
                 MenuItem('Switch to Workspace 2 (Ctrl+Alt+2)',
-                         lambda: threading.Thread(target=self.ws_switch, args=(1,), daemon=True).start()),
+                         lambda: ACTION_POOL.submit(self.ws_switch, 1)),
                 MenuItem('Switch to Workspace 3 (Ctrl+Alt+3)',
-                         lambda: threading.Thread(target=self.ws_switch, args=(2,), daemon=True).start()),
+                         lambda: ACTION_POOL.submit(self.ws_switch, 2)),
             )),
             Menu.SEPARATOR,
             MenuItem('Settings',
@@ -4998,20 +6350,14 @@ class SmartGrid:
         else:
             with self.lock:
                 # Purge all runtime tiling state so next ON starts clean.
-                known_hwnds = (
-                    set(self.window_mgr.grid_state.keys())
-                    | set(self.window_mgr.minimized_windows.keys())
-                    | set(self.window_mgr.maximized_windows.keys())
-                )
-                for hwnd in known_hwnds:
-                    if user32.IsWindow(hwnd):
-                        set_window_border(hwnd, None)
                 self.window_mgr.grid_state.clear()
                 self.window_mgr.minimized_windows.clear()
                 self.window_mgr.maximized_windows.clear()
                 self.window_state_ws.clear()
                 self.last_visible_count = 0
                 self.last_known_count = 0
+            # Outside the lock: only windows that actually carry a border
+            self.window_mgr.clear_all_borders()
         
         self.update_tray_menu()
 
@@ -5050,9 +6396,11 @@ class SmartGrid:
             self._sync_window_state_changes()
             # Ensure newly reopened windows are bound to slots before persistence.
             if self.is_active:
-                with self.lock:
-                    self.ignore_retile_until = 0.0
-                self.smart_tile_with_restore()
+                # Blocking: the save below must see this pass, not a queued one
+                with self._tiling_lock:
+                    with self.lock:
+                        self.ignore_retile_until = 0.0
+                    self.smart_tile_with_restore(blocking=True)
                 self._sync_window_state_changes()
             with self.lock:
                 monitors_to_save = sorted(int(m) for m in self.workspaces.keys())
@@ -5291,8 +6639,8 @@ class SmartGrid:
                         # - only fallback to count inference when no signature exists
                         active_grid_count = sum(
                             1
-                            for hwnd, (m, _c, _r) in self.window_mgr.grid_state.items()
-                            if m == mon_idx and user32.IsWindow(hwnd)
+                            for hwnd in self.window_mgr.grid_state.hwnds_on(mon_idx)
+                            if user32.IsWindow(hwnd)
                         )
                         current_layout_sig = self.layout_signature.get(mon_idx)
                         if current_layout_sig is not None:
@@ -7118,8 +8466,8 @@ class SmartGrid:
                     reset_blocked = (mon_idx, target_ws) in self._manual_layout_reset_block
                     grid_items = [
                         (hwnd, c, r)
-                        for hwnd, (m, c, r) in self.window_mgr.grid_state.items()
-                        if m == mon_idx and user32.IsWindow(hwnd)
+                        for hwnd, c, r in self.window_mgr.grid_state.iter_mon(mon_idx)
+                        if user32.IsWindow(hwnd)
                     ]
 
                 valid_coords = set(grid_coords)
@@ -7603,7 +8951,7 @@ class SmartGrid:
                     return
                 close_picker()
                 if not apply_now:
-                    threading.Thread(target=self.ws_switch, args=(target_ws, mon_idx), daemon=True).start()
+                    ACTION_POOL.submit(self.ws_switch, target_ws, mon_idx)
 
             def save_layout():
                 selection = _get_selected_layout_and_assignments()
@@ -8114,6 +9462,7 @@ class SmartGrid:
         except Exception as e:
             log(f"[ERROR] on_quit_from_tray: {e}")
             # Forcer la sortie en dernier recours
+            self.save_state()
             os._exit(0)
     
     def cleanup(self):
@@ -8127,6 +9476,15 @@ class SmartGrid:
                 self.exit_swap_mode()
             
             self.unregister_hotkeys()
+            
+            if self._raw_input_thread_id:
+                user32.PostThreadMessageW(self._raw_input_thread_id, win32con.WM_QUIT, 0, 0)
+            if self._win_event_thread_id:
+                user32.PostThreadMessageW(self._win_event_thread_id, win32con.WM_QUIT, 0, 0)
+            self._monitor_wake.set()
+            self._mouse_event.set()
+            self.state_debouncer.cancel()  # The exit save_state supersedes it
+            ACTION_POOL.shutdown(wait=False, cancel_futures=True)
         except Exception as e:
             log(f"[ERROR] cleanup: {e}")
     
@@ -8134,12 +9492,194 @@ class SmartGrid:
     # THREADS & MAIN LOOP
     # ==========================================================================
     
+    def _on_win_event(self, hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        """WinEvent callback (hook thread): keep per-window caches fresh."""
+        if not hwnd or id_object != OBJID_WINDOW or id_child != CHILDID_SELF:
+            return
+        
+        try:
+            wm = self.window_mgr
+            if event == EVENT_SYSTEM_FOREGROUND:
+                self._fg_hwnd = hwnd
+                self._track_user_selection(hwnd)
+            elif event == EVENT_OBJECT_NAMECHANGE:
+                wm.title_cache.pop(hwnd, None)
+                # A window may only become "useful" once its title is set
+                if hwnd != wm.user_selected_hwnd and hwnd == self._fg_hwnd:
+                    self._track_user_selection(hwnd)
+            elif event == EVENT_OBJECT_DESTROY:
+                wm.title_cache.pop(hwnd, None)
+                wm.maxstate_cache.pop(hwnd, None)
+                wm.frame_border_cache.pop(hwnd, None)
+                _border_color_cache.pop(hwnd, None)
+                if hwnd == self._fg_hwnd:
+                    self._fg_hwnd = None  # foreground_hwnd() falls back to a live query
+            else:
+                # Any size/state transition may toggle maximized; re-query lazily
+                wm.maxstate_cache.pop(hwnd, None)
+                if event != EVENT_OBJECT_LOCATIONCHANGE:
+                    # Show/hide/minimize may restyle the frame (size check covers moves)
+                    wm.frame_border_cache.pop(hwnd, None)
+                if event == EVENT_SYSTEM_MINIMIZEEND:
+                    self._restore_event.set()  # Wakes load_workspace's restore wait
+            
+            tracked = (hwnd in wm.grid_state or hwnd in wm.minimized_windows or
+                       hwnd in wm.maximized_windows)
+            if tracked:
+                if event == EVENT_OBJECT_DESTROY:
+                    wm.destroyed_hwnds.add(hwnd)
+                elif event == EVENT_OBJECT_SHOW:
+                    wm.destroyed_hwnds.discard(hwnd)  # Recycled handle
+            
+            # Queue top-level windows for a visible-index re-check
+            if event == EVENT_OBJECT_DESTROY:
+                top_level = tracked or hwnd in wm.visible_map
+            elif event == EVENT_SYSTEM_FOREGROUND:
+                top_level = False
+            else:
+                top_level = tracked or user32.GetAncestor(hwnd, GA_ROOT) == hwnd
+            if top_level:
+                wm.visible_dirty.add(hwnd)
+            
+            # Wake monitor_loop only for events that can change tiling
+            if event in (EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_MINIMIZESTART, EVENT_SYSTEM_MINIMIZEEND):
+                wake = True
+            elif event == EVENT_OBJECT_SHOW:
+                wake = top_level
+            elif event == EVENT_OBJECT_NAMECHANGE:
+                wake = False
+            else:  # DESTROY / HIDE / LOCATIONCHANGE of a window we track
+                wake = tracked
+            
+            if wake:
+                self._monitor_hot_until = time.time() + MONITOR_HOT_PERIOD
+                self._monitor_wake.set()
+        except Exception as e:
+            log(f"[ERROR] _on_win_event: {e}")
+    
+    def foreground_hwnd(self):
+        """Foreground hwnd, from the hook cache while WinEvent tracking is active."""
+        if self.window_mgr.event_tracking and self._fg_hwnd:
+            return self._fg_hwnd
+        return user32.GetForegroundWindow()
+    
+    def _track_user_selection(self, hwnd):
+        """Remember hwnd as the user's selection if it is a visible, useful window."""
+        if hwnd and user32.IsWindow(hwnd) and user32.IsWindowVisible(hwnd):
+            title = get_window_title(hwnd)
+            class_name = get_window_class(hwnd)
+            if is_useful_window(title, class_name):
+                self.window_mgr.user_selected_hwnd = hwnd
+    
+    def _wait_for_monitor_events(self):
+        """Sleep until the next monitor_loop pass (event-driven while hooks are active)."""
+        if not self.window_mgr.event_tracking or time.time() < self._monitor_hot_until:
+            time.sleep(MONITOR_POLL_INTERVAL)
+            return
+        self._monitor_wake.wait(MONITOR_IDLE_TIMEOUT)
+    
+    def _create_display_listener(self):
+        """Hidden top-level window (hook thread) that drops the monitor cache on display changes."""
+        global _monitor_cache_listening
+        class_name = "SmartGridDisplayListener"
+        
+        def on_display_change(hwnd, msg, wparam, lparam):
+            if msg == win32con.WM_DISPLAYCHANGE or wparam == win32con.SPI_SETWORKAREA:
+                log("[MONITOR] Display change notification")
+                invalidate_monitor_cache()
+                # DPI/scale changes resize every window frame
+                self.window_mgr.frame_border_cache.clear()
+                self._grid_mappers.clear()
+                self._monitor_wake.set()
+            return win32gui.DefWindowProc(hwnd, msg, wparam, lparam)
+        
+        try:
+            wc = win32gui.WNDCLASS()
+            wc.lpfnWndProc = {
+                win32con.WM_DISPLAYCHANGE: on_display_change,
+                win32con.WM_SETTINGCHANGE: on_display_change,
+            }
+            wc.lpszClassName = class_name
+            try:
+                win32gui.RegisterClass(wc)
+            except Exception:
+                pass
+            
+            # Top-level (not message-only) so it receives broadcast messages
+            hwnd = win32gui.CreateWindowEx(
+                win32con.WS_EX_TOOLWINDOW, class_name, "SmartGrid Display Listener",
+                win32con.WS_POPUP, 0, 0, 0, 0, 0, 0, 0, None
+            )
+            invalidate_monitor_cache()
+            _monitor_cache_listening = True
+            return hwnd
+        except Exception as e:
+            log(f"[ERROR] _create_display_listener: {e}")
+            return None
+    
+    def _win_event_loop(self):
+        """Background thread: own the WinEvent hooks and pump their callbacks."""
+        global _monitor_cache_listening
+        hooks = []
+        listener_hwnd = None
+        try:
+            self._win_event_proc = WINEVENTPROC(self._on_win_event)
+            for event_min, event_max in WIN_EVENT_RANGES:
+                hook = user32.SetWinEventHook(
+                    event_min, event_max, None, self._win_event_proc, 0, 0,
+                    WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+                )
+                if hook:
+                    hooks.append(hook)
+            
+            if len(hooks) != len(WIN_EVENT_RANGES):
+                log("[HOOK] SetWinEventHook failed, keeping polling fallbacks")
+                return
+            
+            self._win_event_thread_id = win32api.GetCurrentThreadId()
+            self.window_mgr.maxstate_cache.clear()
+            self.window_mgr.title_cache.clear()
+            self.window_mgr.frame_border_cache.clear()
+            self.window_mgr.event_tracking = True
+            self._fg_hwnd = user32.GetForegroundWindow()
+            self._track_user_selection(self._fg_hwnd)
+            listener_hwnd = self._create_display_listener()
+            log("[HOOK] WinEvent hooks active")
+            
+            # Out-of-context callbacks are delivered through this thread's queue
+            msg = wintypes.MSG()
+            while not self._stop_event.is_set():
+                ret = user32.GetMessageW(ctypes.byref(msg), None, 0, 0)
+                if ret == 0 or ret == -1:
+                    break
+                user32.DispatchMessageW(ctypes.byref(msg))
+        
+        except Exception as e:
+            log(f"[ERROR] win_event_loop: {e}")
+        
+        finally:
+            self.window_mgr.event_tracking = False
+            self._win_event_thread_id = None
+            _monitor_cache_listening = False
+            if listener_hwnd:
+                try:
+                    win32gui.DestroyWindow(listener_hwnd)
+                except Exception:
+                    pass
+            for hook in hooks:
+                try:
+                    user32.UnhookWinEvent(hook)
+                except Exception:
+                    pass
+    
     def monitor_loop(self):
         """Background loop: auto-retile + border tracking + monitor detection."""
         last_monitor_count = len(self.monitors_cache)
         
         while not self._stop_event.is_set():
             try:
+                self._monitor_wake.clear()
+                
                 # Monitor configuration change detection
                 current_monitors = get_monitors()
                 if len(current_monitors) != last_monitor_count:
@@ -8149,13 +9689,11 @@ class SmartGrid:
                         self.smart_tile_with_restore()
                     last_monitor_count = len(current_monitors)
                 
-                # Track user selection
-                fg = user32.GetForegroundWindow()
-                if fg and user32.IsWindow(fg) and user32.IsWindowVisible(fg):
-                    title = win32gui.GetWindowText(fg)
-                    class_name = win32gui.GetClassName(fg)
-                    if is_useful_window(title, class_name):
-                        self.window_mgr.user_selected_hwnd = fg
+                # Track user selection (pushed by the WinEvent hook when active)
+                if not self.window_mgr.event_tracking:
+                    snapshot = foreground_snapshot()
+                    if snapshot:
+                        self._track_user_selection(snapshot[0])
                 
                 self.update_active_border()
                 
@@ -8332,58 +9870,60 @@ class SmartGrid:
                             self.last_visible_count = current_count
                             self.last_known_count = known_count
                 
-                time.sleep(0.06)
+                self._wait_for_monitor_events()
             
             except Exception as e:
                 log(f"[ERROR] monitor_loop: {e}")
                 time.sleep(0.5)
     
+    def toggle_swap_mode(self):
+        """Enter swap mode, or leave it when already active."""
+        if self.swap_mode_lock:
+            self.exit_swap_mode()
+        else:
+            self.enter_swap_mode()
+    
     def message_loop(self):
         """Main message loop for hotkeys."""
+        # Hotkey id → handler, bound once (swap arrows only act in swap mode,
+        # workspace/float/picker keys only outside it)
+        global_actions = {
+            HOTKEY_TOGGLE: self.toggle_persistent,
+            HOTKEY_RETILE: lambda: ACTION_POOL.submit(self.force_immediate_retile),
+            HOTKEY_SWAP_MODE: self.toggle_swap_mode,
+        }
+        swap_actions = {
+            HOTKEY_SWAP_LEFT: lambda: self.navigate_swap("left"),
+            HOTKEY_SWAP_RIGHT: lambda: self.navigate_swap("right"),
+            HOTKEY_SWAP_UP: lambda: self.navigate_swap("up"),
+            HOTKEY_SWAP_DOWN: lambda: self.navigate_swap("down"),
+            HOTKEY_SWAP_CONFIRM: self.exit_swap_mode,
+        }
+        normal_actions = {
+            HOTKEY_WS1: lambda: ACTION_POOL.submit(self.ws_switch, 0),
+            HOTKEY_WS2: lambda: ACTION_POOL.submit(self.ws_switch, 1),
+            HOTKEY_WS3: lambda: ACTION_POOL.submit(self.ws_switch, 2),
+            HOTKEY_FLOAT_TOGGLE: self.toggle_floating_selected,
+            HOTKEY_LAYOUT_PICKER: self.show_layout_picker,
+        }
+        
         msg = wintypes.MSG()
         while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
             try:
                 if msg.message == win32con.WM_HOTKEY:
-                    if msg.wParam == HOTKEY_TOGGLE:
-                        self.toggle_persistent()
-                    elif msg.wParam == HOTKEY_RETILE:
-                        threading.Thread(target=self.force_immediate_retile, daemon=True).start()
-                    elif msg.wParam == HOTKEY_QUIT:
+                    hk = msg.wParam
+                    if hk == HOTKEY_QUIT:
                         log("[HOTKEY] Ctrl+Alt+Q pressed - Quitting...")
                         self.on_quit_from_tray()  # Reuse the same function
                         break
-                    elif msg.wParam == HOTKEY_SWAP_MODE:
-                        if self.swap_mode_lock:
-                            self.exit_swap_mode()
-                        else:
-                            self.enter_swap_mode()
-                    elif self.swap_mode_lock:
-                        if msg.wParam == HOTKEY_SWAP_LEFT:
-                            self.navigate_swap("left")
-                        elif msg.wParam == HOTKEY_SWAP_RIGHT:
-                            self.navigate_swap("right")
-                        elif msg.wParam == HOTKEY_SWAP_UP:
-                            self.navigate_swap("up")
-                        elif msg.wParam == HOTKEY_SWAP_DOWN:
-                            self.navigate_swap("down")
-                        elif msg.wParam == HOTKEY_SWAP_CONFIRM:
-                            self.exit_swap_mode()
-                    elif msg.wParam == HOTKEY_WS1:
-                        threading.Thread(target=self.ws_switch, args=(0,), daemon=True).start()
-                    elif msg.wParam == HOTKEY_WS2:
-                        threading.Thread(target=self.ws_switch, args=(1,), daemon=True).start()
-                    elif msg.wParam == HOTKEY_WS3:
-                        threading.Thread(target=self.ws_switch, args=(2,), daemon=True).start()
-                    elif msg.wParam == HOTKEY_FLOAT_TOGGLE:
-                        self.toggle_floating_selected()
-                    elif msg.wParam == HOTKEY_LAYOUT_PICKER:
-                        self.show_layout_picker()
+                    action = global_actions.get(hk)
+                    if action is None:
+                        action = (swap_actions if self.swap_mode_lock else normal_actions).get(hk)
+                    if action is not None:
+                        action()
                 
                 elif msg.message == CUSTOM_TOGGLE_SWAP:
-                    if self.swap_mode_lock:
-                        self.exit_swap_mode()
-                    else:
-                        self.enter_swap_mode()
+                    self.toggle_swap_mode()
                 elif msg.message == CUSTOM_OPEN_LAYOUT_PICKER:
                     self.show_layout_picker()
                 elif msg.message == CUSTOM_OPEN_SETTINGS:
@@ -8394,7 +9934,8 @@ class SmartGrid:
                     log("[MAIN] WM_QUIT received - Exiting message loop")
                     break
                 
-                user32.TranslateMessage(ctypes.byref(msg))
+                # No TranslateMessage: this pump carries hotkeys and thread messages
+                # only, WM_CHAR generation would just queue work behind held arrows
                 user32.DispatchMessageW(ctypes.byref(msg))
             
             except Exception as e:
@@ -8407,7 +9948,9 @@ class SmartGrid:
     
     def start(self):
         """Start all background threads."""
+        threading.Thread(target=self._win_event_loop, daemon=True).start()
         threading.Thread(target=self.monitor_loop, daemon=True).start()
+        threading.Thread(target=self._raw_mouse_input_loop, daemon=True).start()
         threading.Thread(target=self.start_drag_snap_monitor, daemon=True).start()
         log("[MAIN] Background threads started")
 
@@ -8590,6 +10133,7 @@ if __name__ == "__main__":
     # Create application instance
     _app_instance = SmartGrid()
     app = _app_instance
+    app.load_state()
     
     # Start background threads
     app.start()
@@ -8621,6 +10165,7 @@ if __name__ == "__main__":
         log(f"[ERROR] main: {e}")
     finally:
         app.cleanup()
+        app.save_state()
         log("[EXIT] SmartGrid stopped.")
         time.sleep(0.2)  # Allow threads to finish
         os._exit(0)  # Force stop all threads